@@ -0,0 +1,70 @@
+
+# ==============================================================================
+# .::AnimationClock class::.
+# Frames of the animations calculated from the logic steps of the game.
+# The sprites look up the frame that corresponds to the current step instead
+# of keeping and increasing their own timers, and the up-and-down movement of
+# the hotspots is read from a table calculated once.
+# ==============================================================================
+#
+#  This file is part of "Mine Squad Pi". Copyright (C) 2026 @salvakantero
+#
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Lesser General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+# ==============================================================================
+
+import constants
+
+
+
+# offset of the hotspots in each logic step of the movement: up to max_offset,
+# a pause, down to 0 and another pause, changing the offset every 'dwell' steps
+def _build_bob_table(max_offset, dwell):
+    offsets = (list(range(1, max_offset + 1)) + [max_offset] +
+               list(range(max_offset - 1, -1, -1)) + [0])
+    return tuple(offset for offset in offsets for _ in range(dwell))
+
+
+
+class AnimationClock():
+    # hotspots (24 steps per cycle)
+    HOTSPOT_BOB = _build_bob_table(constants.HOTSPOT_MAX_Y_OFFSET, constants.HOTSPOT_BOB_DWELL)
+
+    def __init__(self, game):
+        self.game = game # logic steps (game.tick)
+
+
+
+    # current logic step
+    def get_tick(self):
+        return self.game.tick
+
+
+
+    # logic steps since the given one
+    def get_elapsed(self, start):
+        return self.game.tick - start
+
+
+
+    # frame of an animation of 'frame_count' frames that lasts 'dwell' steps
+    # each one and started in the 'start' step (loops)
+    def get_frame(self, frame_count, dwell, start=0):
+        return (self.game.tick - start) // dwell % frame_count
+
+
+
+    # height of the hotspots over their tile in the current step
+    def get_hotspot_offset(self):
+        return self.HOTSPOT_BOB[self.game.tick % len(self.HOTSPOT_BOB)]
@@ -0,0 +1,179 @@
+
+# ==============================================================================
+# .::Benchmark::.
+# Plays the same sessions on every map and screen mode with the dummy video
+# driver, measuring each phase of the frame (input, update, collisions,
+# drawing, presentation). Results are printed and saved as JSON.
+#
+#   python benchmark.py                          generated sessions (seeded)
+#   python benchmark.py --replays replays/       recorded sessions (*.rpl)
+#   python benchmark.py --output new.json --compare old.json
+# ==============================================================================
+#
+#  This file is part of "Mine Squad Pi". Copyright (C) 2026 @salvakantero
+#
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Lesser General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+# ==============================================================================
+
+import argparse
+import glob
+import itertools
+import json
+import os
+import platform
+import time
+
+# the simulation sets the SDL dummy drivers before pygame starts
+from simulation import Simulation, random_walk
+import pygame
+import constants
+import enums
+
+from profiler import Profiler
+from replay import Replay
+
+
+
+SCREEN_MODES = {'window': enums.SM_WINDOW, '4:3': enums.SM_4_3, '16:9': enums.SM_16_9}
+# reported values: the phases of the profiler, all the drawing and the whole frame
+COLUMNS = Profiler.PHASES + ('draw', 'frame')
+DRAW_PHASES = ('map', 'mines', 'sprites')
+
+
+
+# value below which the given percentage of the (sorted) values are found
+def percentile(values, percent):
+    index = max(0, min(len(values) - 1, round(percent / 100 * len(values)) - 1))
+    return values[index]
+
+
+
+# mean, p95 and p99 (in milliseconds) of each column
+def summarize(frames):
+    columns = {}
+    draw_indexes = [Profiler.PHASES.index(phase) for phase in DRAW_PHASES]
+    for i, column in enumerate(COLUMNS):
+        if column == 'draw':
+            values = [sum(frame[j] for j in draw_indexes) for frame in frames]
+        elif column == 'frame':
+            values = [sum(frame) for frame in frames]
+        else:
+            values = [frame[i] for frame in frames]
+        values.sort()
+        columns[column] = {
+            'mean': round(sum(values) / len(values) * 1000, 4),
+            'p95': round(percentile(values, 95) * 1000, 4),
+            'p99': round(percentile(values, 99) * 1000, 4)}
+    return columns
+
+
+
+# recorded sessions, or one generated session per map
+def load_sessions(path, frames, seed):
+    if path:
+        files = sorted(glob.glob(os.path.join(path, '*.rpl'))) if os.path.isdir(path) else [path]
+        return [Replay.load(file) for file in files]
+    sessions = []
+    for map_number in range(constants.MAX_LEVEL + 1):
+        replay = Replay(seed, enums.PL_BLAZE, enums.DF_NORMAL, map_number)
+        replay.inputs = bytearray(itertools.islice(random_walk(seed + map_number), frames))
+        sessions.append(replay)
+    return sessions
+
+
+
+# plays a session (one logic step per frame) and returns the frame timings
+def run_session(simulation, replay, frames):
+    game = simulation.game
+    game.selected_player = replay.selected_player
+    game.selected_difficulty = replay.difficulty
+    game.pixel_collisions = replay.pixel_collisions
+    simulation.reset(replay.map_number, replay.seed)
+    simulation.scoreboard.reset(replay.map_number)
+    simulation.scoreboard.invalidate()
+    profiler = game.profiler
+    profiler.record()
+    for inputs in replay.inputs[:frames]:
+        profiler.start_frame()
+        result = simulation.step(inputs)
+        game.draw_world(simulation.player, simulation.map, simulation.camera)
+        simulation.scoreboard.update(simulation.player)
+        profiler.mark('scoreboard')
+        game.update_screen()
+        profiler.end_frame()
+        if result in (enums.SR_GAME_OVER, enums.SR_GAME_WON):
+            break
+    return profiler.stop_recording()
+
+
+
+# prints the difference between the mean frame times of two runs
+def compare(results, old_results):
+    old = {(r['map'], r['mode']): r for r in old_results['results']}
+    print(f"\n{'map':>3} {'mode':>6} {'old ms':>8} {'new ms':>8} {'change':>8}")
+    for result in results['results']:
+        previous = old.get((result['map'], result['mode']))
+        if previous is None:
+            continue
+        old_mean = previous['phases']['frame']['mean']
+        new_mean = result['phases']['frame']['mean']
+        change = (new_mean - old_mean) / old_mean * 100 if old_mean else 0.0
+        print(f"{result['map']:>3} {result['mode']:>6} {old_mean:>8.3f} {new_mean:>8.3f} {change:>+7.1f}%")
+
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Mine Squad Pi benchmark')
+    parser.add_argument('--replays', help='replay file or folder with *.rpl files (default: generated sessions)')
+    parser.add_argument('--frames', type=int, default=1200, help='maximum frames per session')
+    parser.add_argument('--seed', type=int, default=1, help='seed of the generated sessions')
+    parser.add_argument('--modes', default=','.join(SCREEN_MODES), help='screen modes to measure')
+    parser.add_argument('--output', default='benchmark.json', help='results file (JSON)')
+    parser.add_argument('--compare', help='previous results file to compare with')
+    args = parser.parse_args()
+
+    simulation = Simulation(headless=False)
+    game = simulation.game
+    game.max_fps = 0 # no frame rate limit
+    sessions = load_sessions(args.replays, args.frames, args.seed)
+    results = {
+        'date': time.strftime('%Y-%m-%d %H:%M:%S'),
+        'python': platform.python_version(),
+        'pygame': pygame.version.ver,
+        'machine': platform.machine(),
+        'scanlines': game.config.data['scanlines'],
+        'frames': args.frames,
+        'results': []}
+
+    print(f"{'map':>3} {'mode':>6} {'frames':>6} {'mean':>7} {'p95':>7} {'p99':>7}   mean ms per phase")
+    for mode in args.modes.split(','):
+        game.config.data['screen_mode'] = SCREEN_MODES[mode] # not saved
+        game.apply_display_settings()
+        for replay in sessions:
+            frames = run_session(simulation, replay, args.frames)
+            phases = summarize(frames)
+            results['results'].append({
+                'map': replay.map_number, 'mode': mode, 'frames': len(frames), 'phases': phases})
+            detail = ' '.join(f"{phase}={phases[phase]['mean']:.3f}" for phase in COLUMNS[:-1])
+            frame = phases['frame']
+            print(f"{replay.map_number:>3} {mode:>6} {len(frames):>6} {frame['mean']:>7.3f} "
+                  f"{frame['p95']:>7.3f} {frame['p99']:>7.3f}   {detail}")
+
+    with open(args.output, 'w') as f:
+        json.dump(results, f, indent=1)
+    print(f'\nresults saved to {args.output}')
+    if args.compare:
+        with open(args.compare) as f:
+            compare(results, json.load(f))
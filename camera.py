@@ -29,6 +29,12 @@ class Camera:
     def __init__(self):
         self.x = 0
         self.y = 0
+        # position in the previous logic step (render interpolation)
+        self.prev_x = 0
+        self.prev_y = 0
+        # interpolation factor used by the sprites when drawing (1 = current step)
+        self.alpha = 1.0
+        self._view = None # interpolated copy of the camera for drawing
 
         # cache frequently used values
         self.half_map_width = constants.SCREEN_MAP_UNSCALED_SIZE[0] // 2
@@ -39,8 +45,32 @@ class Camera:
 
 
     def update(self, player_x, player_y):
+        self.prev_x, self.prev_y = self.x, self.y
         # updates the camera position based on the player's position
         # the camera should be centered on the player
         # the camera cannot go beyond the map boundaries
         self.x = max(0, min(player_x - self.half_map_width, self.max_x))
         self.y = max(0, min(player_y - self.half_map_height, self.max_y))
+
+
+
+    # returns a camera placed between the previous and the current logic step,
+    # used to draw the frame (alpha = 0..1, elapsed fraction of the next step)
+    def view(self, alpha):
+        if self._view is None:
+            self._view = Camera()
+        view = self._view
+        view.alpha = alpha
+        view.x = round(self.lerp(self.prev_x, self.x, alpha))
+        view.y = round(self.lerp(self.prev_y, self.y, alpha))
+        return view
+
+
+
+    # value between the previous and the current logic step.
+    # Jumps (teleports, map changes) are not interpolated.
+    @staticmethod
+    def lerp(previous, current, alpha):
+        if abs(current - previous) > constants.TILE_SIZE:
+            return current
+        return previous + (current - previous) * alpha
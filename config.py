@@ -39,7 +39,13 @@ class Configuration():
             # default values
             'screen_mode' : 0, # 0 = window, 1 = 4:3, 2 = 16:9
             'scanlines' : False,
-            'control' : enums.CT_CLASSIC # 0 = classic, 1 = gamer, 2 = retro, 3 = joypad
+            'control' : enums.CT_CLASSIC, # 0 = classic, 1 = gamer, 2 = retro, 3 = joypad
+            'seed' : None, # random seed for the games (None = a different one each game)
+            'max_fps' : 60, # frame rate limit of the screen (0 = no limit)
+            'frame_budget' : 0, # milliseconds per frame before logging a hitch (0 = disabled)
+            'telemetry' : False, # per-frame metrics saved in 'telemetry.jsonl'
+            'pixel_collisions' : False, # pixel-precise collisions (player, enemies and bullets)
+            'batch_enemies' : False # patrolling enemies updated with NumPy (if installed)
         }
         # default values for controls (classic layout)
         self.up_key = pygame.K_UP
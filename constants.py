@@ -36,9 +36,12 @@ HALF_TILE_SIZE = TILE_SIZE // 2 # half size of each tile in pixels
 TILE_CENTER_OFFSET = 4  # pre-calculated for blast positioning
 MAP_TILE_SIZE = 30, 40 # map size in tiles (width, height)
 MAP_PIXEL_SIZE = MAP_TILE_SIZE[0] * TILE_SIZE, MAP_TILE_SIZE[1] * TILE_SIZE # map size in pixels
+FPS = 60 # logic steps per second (and default frame rate limit of the screen)
+MAX_FRAME_STEPS = 5 # maximum logic steps per frame (the game slows down below 12 FPS)
 H_MARGIN = 40 # horizontal distance between the edge and the playing area (windowed mode)
 V_MARGIN = 20 # vertical distance between the edge and the playing area (windowed mode)
 
+MAX_LEVEL = 8 # last map (9 levels, from 0 to 8)
 NUM_MINES =   25, 30, 35, 40, 45, 50, 55, 60, 65 # number of mines per map
 NUM_BEACONS = 30, 35, 40, 45, 50, 55, 60, 65, 70 # number of flags/beacons per map
 
@@ -46,11 +49,13 @@ NUM_BEACONS = 30, 35, 40, 45, 50, 55, 60, 65, 70 # number of flags/beacons per m
 TIME_REMAINING = 40000 # remaining shield time (approximately 40 seconds)
 MAX_AMMO = 20 # maximum number of bullets
 AMMO_ROUND = 10 # bullets per reload
+MAX_SHOTS = 3, 2, 1 # bullets on the screen at the same time (EASY, NORMAL, HARD)
 ANIM_SPEED_IDLE = 16 # loops between each frame change
 ANIM_SPEED_WALK = 6 # loops between each frame change in walking state
 # XY starting position
 PLAYER_X_INI = int(MAP_TILE_SIZE[0] // 4) * TILE_SIZE
 PLAYER_Y_INI = (MAP_TILE_SIZE[1] - 1) * TILE_SIZE
+PLAYER_HITBOX_RATIO = 0.60 # collision box, as a ratio of the image size
 
 # enemies
 # Base pause durations (will decrease based on stage)
@@ -62,11 +67,18 @@ def get_chaser_enemy_pause_duration(stage):
     base_durations = [60, 55, 50]  # stage 1, 2, 3
     return base_durations[min(stage, 2)]
 
-CHASER_ACTIVATION_RANGE = 5  # the enemy activates when the player is X tiles or less away
+CHASER_ACTIVATION_RANGE = 5  # the enemy activates when the player is X tiles or less away (and in sight)
+SIGHT_CACHE_SIZE = 4096  # line of sight results kept per map (enemy tile, player tile)
 ENEMY_RESPAWN_TIME = 15000  # time in milliseconds before enemy respawns (10 seconds)
 ENEMY_RESPAWN_SAFE_DISTANCE = 5  # minimum distance in tiles between player and enemy respawn position
+# level of detail: enemies off screen and further than X tiles from the player
+# only update every Y logic steps (simulating the missed steps at once)
+ENEMY_LOD_DISTANCE = 10
+ENEMY_LOD_INTERVAL = 4
 # SCORPION, SNAKE, SOLDIER1, PROJECTILE, CRAB, SOLDIER2, SKIER, WILDBOAR, SOLDIER3
 ENEMY_LIFE = 1, 1, 2, 1, 2, 3, 2, 3, 3
+# collision box, as a ratio of the image size (same order as ENEMY_LIFE)
+ENEMY_HITBOX_RATIO = 0.60, 0.60, 0.60, 0.60, 0.60, 0.60, 0.60, 0.60, 0.60
 
 # enemies per map (map, type, movement, tile_x1, tile_y1, tile_x2, tile_y2)
 ENEMIES_DATA = [
@@ -173,6 +185,9 @@ ENEMIES_DATA = [
     (8, enums.EN_SOLDIER2, enums.EM_CHASER, 7, 14, 0, 0),]
 
 # hotspot data
+HOTSPOT_HITBOX_RATIO = 0.60 # collision box, as a ratio of the image size
+HOTSPOT_MAX_Y_OFFSET = 5 # height of the up-and-down movement (pixels)
+HOTSPOT_BOB_DWELL = 2 # logic steps between each change of height
 HOTSPOT_DATA = [
     # Type            Map
     [enums.HS_LIFE,   0],
@@ -25,10 +25,26 @@
 import pygame
 import constants
 import enums
-import random
 
 # unit directions for random movement
 _RANDOM_DIRECTIONS = ((0, -1), (1, 0), (0, 1), (-1, 0))
+# directions allowed by each neighbour bitmask (NB_UP, NB_RIGHT, NB_DOWN, NB_LEFT)
+_DIRECTIONS_BY_MASK = tuple(
+    tuple(direction for bit, direction in enumerate(_RANDOM_DIRECTIONS) if mask & (1 << bit))
+    for mask in range(16))
+
+
+
+# position after some steps going back and forth (1 pixel per step) from 'start' to 'end'
+# (a triangle wave with a period of twice the length of the path)
+def _bounce(start, end, steps):
+    length = abs(end - start)
+    if length == 0:
+        return start
+    offset = steps % (2 * length)
+    if offset > length:
+        offset = 2 * length - offset
+    return start + offset if end > start else start - offset
 
 
 
@@ -36,6 +52,7 @@ class Enemy(pygame.sprite.Sprite):
     def __init__(self, enemy_data, player_rect, enemy_images, map):
         super().__init__()
         self.map = map # get_tile_type()
+        self._rng = map.game.rng.stream('enemies') # random movement
         self.stage = map.stage # current stage (0, 1, 2)
         # enemy_data = (map, type, movement, tile_x1, tile_y1, tile_x2, tile_y2)
         # enemy type:
@@ -55,6 +72,7 @@ class Enemy(pygame.sprite.Sprite):
         self.is_dead = False
         self.death_time = 0
         self.respawn_delay = constants.ENEMY_RESPAWN_TIME
+        self._respawn_event = None # respawn time (scheduler)
         self.original_data = enemy_data  # store original data for respawn
         
         # cache frequently used values
@@ -67,7 +85,11 @@ class Enemy(pygame.sprite.Sprite):
         # to xy values
         self.x2 = enemy_data[5] * self._tile_size
         self.y2 = enemy_data[6] * self._tile_size
-        # speed
+        # logic step of the spawn (the patrols are calculated from it)
+        self._spawn_tick = map.game.tick
+        # previous logic step (render interpolation)
+        self.prev_x, self.prev_y = self.x, self.y
+        # speed (random and chaser movement)
         self.vx = 0
         self.vy = 0
 
@@ -82,58 +104,87 @@ class Enemy(pygame.sprite.Sprite):
         # player's current position
         self.player = player_rect
 
+        # arrays of the EnemyManager (if the enemy is updated there)
+        self.manager = None
+        self.batch_index = -1
+
+        # level of detail (distant enemies off the screen update less often)
+        self._lod_pending = 0 # logic steps not simulated yet
+        # update turn of the enemy, so the distant enemies do not all update in the same step
+        self._lod_phase = constants.ENEMIES_DATA.index(enemy_data) % constants.ENEMY_LOD_INTERVAL
+        self._lod_distance = constants.ENEMY_LOD_DISTANCE
+
         # images
         self.image_list = enemy_images
         self.frame_index = 0  # frame number
-        self.animation_timer = 0  # timer to change frame (start at 0)
-        self.animation_speed = 18  # frame dwell time
+        self.animation_speed = 18  # frame dwell time (counted from the spawn step)
         self.image = self.image_list[0]  # first frame
+        self.mask_list = map.game.enemy_masks[self.type] # collision mask of each frame
+        self.mask = self.mask_list[0]
 
         self.rect = self.image.get_rect()
-
-        # determine initial direction based on movement type
-        if self.movement == enums.EM_HORIZONTAL:
-            self.vx = 1 if self.x2 > self.x1 else -1
-        elif self.movement == enums.EM_HORIZONTAL_LOOP:
-            self.vx = -2
-        elif self.movement == enums.EM_VERTICAL:
-            self.vy = 1 if self.y2 > self.y1 else -1
-        elif self.movement == enums.EM_VERTICAL_LOOP:
-            self.vy = 2
-        elif self.movement == enums.EM_RANDOM:
+        # collision box (smaller than the image), moved along with the rect
+        ratio = constants.ENEMY_HITBOX_RATIO[self.type]
+        width, height = self.rect.size
+        self.hitbox = self.rect.inflate(width * ratio - width, height * ratio - height)
+        self._hitbox_offset = self.hitbox.x - self.rect.x, self.hitbox.y - self.rect.y
+        # size in tiles (navigation grid of the map)
+        self._footprint = (-(-width // self._tile_size), -(-height // self._tile_size))
+
+        # initial direction of the random movement (the patrols do not use speeds)
+        if self.movement == enums.EM_RANDOM:
             self._set_random_direction()
 
 
 
     def animate(self):
-        self.animation_timer += 1
-
-        # exceeded the frame time?
-        if self.animation_timer >= self.animation_speed:
-            self.animation_timer = 0
-            # cycle through frames
-            self.frame_index = (self.frame_index + 1) % len(self.image_list)
-            self.image = self.image_list[self.frame_index]
+        # frame of the current logic step
+        frame_index = self.map.game.animation_clock.get_frame(
+            len(self.image_list), self.animation_speed, self._spawn_tick)
+        if frame_index != self.frame_index:
+            self.frame_index = frame_index
+            self.image = self.image_list[frame_index]
+            self.mask = self.mask_list[frame_index]
 
 
 
-    def update(self):
+    def update(self, camera):
+        self.prev_x, self.prev_y = self.x, self.y
         # if dead, do not update movement or animation
         if self.is_dead:
             return
 
+        # level of detail: off the screen and far from the player, the enemy
+        # only moves in its turn, catching up with all the steps missed
+        self._lod_pending += 1
+        visible = self._is_visible(camera)
+        if not visible and not self._is_player_near() and \
+           (self.map.game.tick + self._lod_phase) % constants.ENEMY_LOD_INTERVAL:
+            return
+
         # movement handling
-        if self.movement == enums.EM_HORIZONTAL: self._update_horizontal_movement()
-        elif self.movement == enums.EM_VERTICAL: self._update_vertical_movement()
-        elif self.movement == enums.EM_HORIZONTAL_LOOP: self._update_horizontal_loop_movement()
-        elif self.movement == enums.EM_VERTICAL_LOOP: self._update_vertical_loop_movement()
-        elif self.movement == enums.EM_RANDOM:   self._update_random_movement()
-        elif self.movement == enums.EM_CHASER:   self._update_chaser_movement()
+        # (the patrols are calculated from the logic steps since the (re)spawn,
+        # so the skipped steps cost nothing)
+        steps = self.map.game.tick - self._spawn_tick
+        if self.movement == enums.EM_HORIZONTAL: self._set_horizontal_position(steps)
+        elif self.movement == enums.EM_VERTICAL: self._set_vertical_position(steps)
+        elif self.movement == enums.EM_HORIZONTAL_LOOP: self._set_horizontal_loop_position(steps)
+        elif self.movement == enums.EM_VERTICAL_LOOP: self._set_vertical_loop_position(steps)
+        else:
+            update_movement = (self._update_random_movement if self.movement == enums.EM_RANDOM
+                               else self._update_chaser_movement)
+            for _ in range(self._lod_pending):
+                update_movement()
+        self._lod_pending = 0
 
         # apply the calculated position and the corresponding frame
         self.rect.x = self.x
         self.rect.y = self.y
-        self.animate()
+        self.hitbox.topleft = (self.rect.x + self._hitbox_offset[0],
+                               self.rect.y + self._hitbox_offset[1])
+        # the animation is not seen off the screen
+        if visible:
+            self.animate()
 
 
 
@@ -144,47 +195,28 @@ class Enemy(pygame.sprite.Sprite):
 
         if self._is_visible(camera):
             # draw the enemy on the screen with camera offset
-            screen_x = self.x - camera.x
-            screen_y = self.y - camera.y
+            screen_x = camera.lerp(self.prev_x, self.x, camera.alpha) - camera.x
+            screen_y = camera.lerp(self.prev_y, self.y, camera.alpha) - camera.y
             surface.blit(self.image, (screen_x, screen_y))
 
 
 
     ##### auxiliary functions #####
 
-    # check whether a position is within the map boundaries and there are no obstacles.
-    def _is_position_valid(self, x, y):
-        # check map limits
-        if not (0 <= x <= constants.MAP_PIXEL_SIZE[0] - self.rect.width and
-                0 <= y <= constants.MAP_PIXEL_SIZE[1] - self.rect.height):
-            return False
-
-        # check corners for obstacles
-        tile_size = self._tile_size
-        rect_w = self.rect.width - 1
-        rect_h = self.rect.height - 1
-        for dx, dy in ((0, 0), (rect_w, 0), (0, rect_h), (rect_w, rect_h)):
-            if self.map.get_tile_type((x + dx) // tile_size, (y + dy) // tile_size) == enums.TT_OBSTACLE:
-                return False
-        return True
-
-
-
     # sets a random direction for the RANDOM type
     def _set_random_direction(self):        
-        # try directions in random order until a valid one is found
-        dirs = list(_RANDOM_DIRECTIONS)
-        random.shuffle(dirs)
-        for dx, dy in dirs:
-            tx = self.x + dx * self._tile_size
-            ty = self.y + dy * self._tile_size
-            if self._is_position_valid(tx, ty):
-                self.vx, self.vy = dx, dy
-                self.target_x, self.target_y = tx, ty
-                self.moving_to_target = True
-                self.is_paused = False
-                self.pause_timer = 0
-                return
+        # random direction among the enterable neighbours of the tile
+        directions = _DIRECTIONS_BY_MASK[self.map.get_neighbours(
+            self.x // self._tile_size, self.y // self._tile_size, self._footprint)]
+        if directions:
+            dx, dy = self._rng.choice(directions)
+            self.vx, self.vy = dx, dy
+            self.target_x = self.x + dx * self._tile_size
+            self.target_y = self.y + dy * self._tile_size
+            self.moving_to_target = True
+            self.is_paused = False
+            self.pause_timer = 0
+            return
         # no valid direction found - stay paused
         self.vx = self.vy = 0
         self.moving_to_target = False
@@ -193,24 +225,34 @@ class Enemy(pygame.sprite.Sprite):
 
 
     
-    # check whether the player is within the activation range.
-    def _is_player_in_range(self):
+    # tiles of the enemy and the player ((None, None) without player)
+    def _get_chase_tiles(self):
         if self.player is None:
-            return False
-             
-        # calculate distance in tiles using cached values
-        enemy_tile_x = (self.x + self.rect.width // 2) // self._tile_size
-        enemy_tile_y = (self.y + self.rect.height // 2) // self._tile_size
-        player_tile_x = self.player.centerx // self._tile_size
-        player_tile_y = self.player.centery // self._tile_size
+            return None, None
+        enemy_tile = (int((self.x + self.rect.width // 2) // self._tile_size),
+                      int((self.y + self.rect.height // 2) // self._tile_size))
+        player_tile = (self.player.centerx // self._tile_size, self.player.centery // self._tile_size)
+        return enemy_tile, player_tile
 
-        dx = enemy_tile_x - player_tile_x
-        dy = enemy_tile_y - player_tile_y
+
+
+    # check whether the player is within the activation range.
+    def _is_player_in_range(self, enemy_tile, player_tile):
+        if player_tile is None:
+            return False
+        dx = enemy_tile[0] - player_tile[0]
+        dy = enemy_tile[1] - player_tile[1]
         # use pre-calculated squared range for optimal performance
         return (dx * dx + dy * dy) <= self._activation_range_squared
 
 
 
+    # check if there are no walls between the enemy and the player
+    def _is_player_in_sight(self, enemy_tile, player_tile):
+        return self.map.has_line_of_sight(enemy_tile, player_tile)
+
+
+
     # updates the direction towards the player for CHASER type
     def _update_chaser_direction(self):
         if self.player is None:
@@ -221,71 +263,21 @@ class Enemy(pygame.sprite.Sprite):
         self.x = round(self.x / tile_size) * tile_size
         self.y = round(self.y / tile_size) * tile_size
 
+        # next tile on the shortest way to the player (shared distance field)
         enemy_tile_x = self.x // tile_size
         enemy_tile_y = self.y // tile_size
-        player_tile_x = self.player.centerx // tile_size
-        player_tile_y = self.player.centery // tile_size
-        dx = player_tile_x - enemy_tile_x
-        dy = player_tile_y - enemy_tile_y
-
-        # determine target tile to move to
-        target_x = self.x
-        target_y = self.y
-
-        # try to move towards the player, checking for obstacles
-        horizontal_blocked = False
-        vertical_blocked = False
-
-        # check horizontal movement
-        if dx != 0:
-            test_x = self.x + (tile_size if dx > 0 else -tile_size)
-            if self._is_position_valid(test_x, self.y):
-                target_x = test_x
-            else:
-                horizontal_blocked = True
-
-        # check vertical movement
-        if dy != 0:
-            test_y = self.y + (tile_size if dy > 0 else -tile_size)
-            if self._is_position_valid(self.x, test_y):
-                target_y = test_y
-            else:
-                vertical_blocked = True
-
-        # decide which direction to move based on distance and obstacles
-        if horizontal_blocked and vertical_blocked:
-            # both directions blocked, stay in place
+        player_tile = (self.player.centerx // tile_size, self.player.centery // tile_size)
+        flow_field = self.map.flow_field
+        if flow_field.get_distance(enemy_tile_x, enemy_tile_y, player_tile) == flow_field.UNREACHABLE:
+            # no way to the player, stay in place
             self.moving_to_target = False
             self.vx = self.vy = 0
             return
-        elif horizontal_blocked:
-            # can only move vertically
-            if target_y != self.y:
-                self.target_x = self.x
-                self.target_y = target_y
-            else:
-                self.moving_to_target = False
-                self.vx = self.vy = 0
-                return
-        elif vertical_blocked:
-            # can only move horizontally
-            if target_x != self.x:
-                self.target_x = target_x
-                self.target_y = self.y
-            else:
-                self.moving_to_target = False
-                self.vx = self.vy = 0
-                return
-        else:
-            # both directions are valid, choose based on greater distance
-            if abs(dx) > abs(dy):
-                # prefer horizontal movement
-                self.target_x = target_x
-                self.target_y = self.y
-            else:
-                # prefer vertical movement
-                self.target_x = self.x
-                self.target_y = target_y
+        # (None on the player's tile)
+        neighbours = self.map.get_neighbours(enemy_tile_x, enemy_tile_y, self._footprint)
+        dx, dy = flow_field.get_direction(enemy_tile_x, enemy_tile_y, player_tile, neighbours) or (0, 0)
+        self.target_x = self.x + dx * tile_size
+        self.target_y = self.y + dy * tile_size
 
         # set velocity towards the target tile
         dx_target = self.target_x - self.x
@@ -308,6 +300,17 @@ class Enemy(pygame.sprite.Sprite):
 
 
 
+    # check whether the player is within the level of detail distance (full updates)
+    def _is_player_near(self):
+        if self.player is None:
+            return False
+        tile_size = self._tile_size
+        dx = (self.x + self.rect.width // 2) // tile_size - self.player.centerx // tile_size
+        dy = (self.y + self.rect.height // 2) // tile_size - self.player.centery // tile_size
+        return max(abs(dx), abs(dy)) <= self._lod_distance
+
+
+
     # check if enemy is visible within camera bounds
     def _is_visible(self, camera):
         return (
@@ -322,52 +325,35 @@ class Enemy(pygame.sprite.Sprite):
 
 
 
-    # handle horizontal movement
-    def _update_horizontal_movement(self):
-        self.x = self.x + self.vx   
-        # determine left and right boundaries
-        min_x, max_x = min(self.x1, self.x2), max(self.x1, self.x2)        
-        # detect when reaching either boundary and reverse direction
-        if self.x <= min_x or self.x >= max_x:
-            self.vx = -self.vx
-            # ensure position stays within boundaries
-            self.x = max(min_x, min(self.x, max_x))
+    # horizontal patrol, back and forth between x1 and x2
+    def _set_horizontal_position(self, steps):
+        self.x = _bounce(self.x1, self.x2, steps)
 
 
 
-    # handle vertical movement
-    def _update_vertical_movement(self):
-        self.y = self.y + self.vy
-        # determine upper and lower boundaries
-        min_y, max_y = min(self.y1, self.y2), max(self.y1, self.y2)
-        # detect when reaching either boundary and reverse direction
-        if self.y <= min_y or self.y >= max_y:
-            self.vy = -self.vy
-            # ensure position stays within boundaries
-            self.y = max(min_y, min(self.y, max_y))
+    # vertical patrol, back and forth between y1 and y2
+    def _set_vertical_position(self, steps):
+        self.y = _bounce(self.y1, self.y2, steps)
 
 
 
-    # handle horizontal loop movement (teleports back to start)
-    # always moves from right to left
-    def _update_horizontal_loop_movement(self):
-        self.x = self.x + self.vx      
-        if self.vx < 0:
-            if self.x <= self.x1: # check if reached end
-                self.x = self.x2  # teleport back to start
+    # horizontal loop, from x2 to x1 (2 pixels per step) and teleport back to x2
+    def _set_horizontal_loop_position(self, steps):
+        period = -(-(self.x2 - self.x1) // 2) # steps between teleports
+        if period <= 0:
+            self.x = self.x2
+        else:
+            self.x = self.x2 - 2 * ((steps - 1) % period)
 
 
 
-    # handle vertical loop movement (teleports back to start)
-    def _update_vertical_loop_movement(self):
-        self.y = self.y + self.vy
-        # determine direction and check if reached end
-        if self.vy > 0:  # moving down
-            if self.y >= self.y2:
-                self.y = self.y1  # teleport back to start
-        else:  # moving up
-            if self.y <= self.y2:
-                self.y = self.y1  # teleport back to start
+    # vertical loop, from y1 to y2 (2 pixels per step) and teleport back to y1
+    def _set_vertical_loop_position(self, steps):
+        period = -(-(self.y2 - self.y1) // 2) # steps between teleports
+        if period <= 0:
+            self.y = self.y1
+        else:
+            self.y = self.y1 + 2 * (steps % period)
 
 
 
@@ -415,12 +401,14 @@ class Enemy(pygame.sprite.Sprite):
 
     # manages the pursuit movement with activation zone and pauses
     def _update_chaser_movement(self):
-        # check if the player is in range
-        player_in_range = self._is_player_in_range()
+        # check if the player is in range (tiles shared with the sight check)
+        enemy_tile, player_tile = self._get_chase_tiles()
+        player_in_range = self._is_player_in_range(enemy_tile, player_tile)
 
         # handle activation/deactivation
-        if player_in_range and not self.is_active:
-            # player enters range - activate enemy
+        # (once active, the enemy follows the player around the walls while in range)
+        if player_in_range and not self.is_active and self._is_player_in_sight(enemy_tile, player_tile):
+            # player enters range and sight - activate enemy
             self.is_active = True
             self.is_paused = True
             self.pause_timer = 0
@@ -477,8 +465,22 @@ class Enemy(pygame.sprite.Sprite):
     # mark the enemy as dead and record the time
     def mark_as_dead(self):
         self.is_dead = True
-        self.death_time = pygame.time.get_ticks()
+        self.death_time = self.map.game.get_ticks()
         self.health = 0
+        game = self.map.game
+        game.live_enemies -= 1
+        self._respawn_event = game.scheduler.at(
+            game.get_step(self.death_time + self.respawn_delay), game.queue_enemy_respawn, self)
+        if self.manager is not None:
+            self.manager.sync(self)
+
+
+
+    # forgets the pending respawn (change of map)
+    def cancel_respawn(self):
+        if self._respawn_event is not None:
+            self._respawn_event.cancel()
+            self._respawn_event = None
 
 
 
@@ -514,12 +516,17 @@ class Enemy(pygame.sprite.Sprite):
         self.y = self.y1 = self.original_data[4] * self._tile_size
         self.x2 = self.original_data[5] * self._tile_size
         self.y2 = self.original_data[6] * self._tile_size
+        self._spawn_tick = self.map.game.tick
         if self.movement == enums.EM_HORIZONTAL_LOOP:
             self.x = self.x2
+            # already at the start of the loop, one step ahead of the first spawn (x1)
+            self._spawn_tick -= 1
         # restore health
         self.health = self.max_health
         self.is_dead = False
         self.death_time = 0
+        self._respawn_event = None
+        self.map.game.live_enemies += 1
 
         # restore velocity and state
         self.vx = 0
@@ -531,22 +538,20 @@ class Enemy(pygame.sprite.Sprite):
         self.target_y = 0
         self.moving_to_target = False
 
-        # restart animation
+        # restart animation (first frame)
         self.frame_index = 0
-        self.animation_timer = 0
-
-        # determine initial direction based on movement type
-        if self.movement == enums.EM_HORIZONTAL:
-            self.vx = 1 if self.x2 > self.x1 else -1
-        elif self.movement == enums.EM_HORIZONTAL_LOOP:
-            self.vx = -2
-        elif self.movement == enums.EM_VERTICAL:
-            self.vy = 1 if self.y2 > self.y1 else -1
-        elif self.movement == enums.EM_VERTICAL_LOOP:
-            self.vy = 2
-        elif self.movement == enums.EM_RANDOM:
+        self.image = self.image_list[0]
+        self.mask = self.mask_list[0]
+        self._lod_pending = 0
+
+        # initial direction of the random movement (the patrols do not use speeds)
+        if self.movement == enums.EM_RANDOM:
             self._set_random_direction()
 
         # update rect
         self.rect.x = self.x
         self.rect.y = self.y
+        self.hitbox.topleft = (self.rect.x + self._hitbox_offset[0],
+                               self.rect.y + self._hitbox_offset[1])
+        if self.manager is not None:
+            self.manager.sync(self)
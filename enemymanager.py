@@ -0,0 +1,198 @@
+
+# ==============================================================================
+# .::EnemyManager class::.
+# Alternative update of the enemies for maps with many of them (optional, it
+# needs NumPy). Positions, paths, spawn steps and animation frames of
+# the patrolling enemies are kept in arrays and advanced in vectorized steps;
+# the Enemy objects remain as sprite views for drawing and collisions, and
+# are only brought up to date when they can be seen or touched (on screen,
+# near the player, or moving to another cell of the collision index).
+# Random and chaser enemies are still updated one by one.
+# ==============================================================================
+#
+#  This file is part of "Mine Squad Pi". Copyright (C) 2026 @salvakantero
+#
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Lesser General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+# ==============================================================================
+
+import constants
+import enums
+
+
+
+class EnemyManager():
+    # movements calculated in the arrays
+    PATROLS = (enums.EM_HORIZONTAL, enums.EM_VERTICAL, enums.EM_HORIZONTAL_LOOP, enums.EM_VERTICAL_LOOP)
+
+    def __init__(self, game, enabled):
+        self.game = game
+        self.available = False
+        self.group = None # sprite group of the enemies (collision index)
+        self.enemies = [] # patrols, in the same order as the arrays
+        self.others = [] # random and chaser enemies
+        if not enabled:
+            return
+        try:
+            import numpy
+            self.np = numpy
+            self.available = True
+        except ImportError:
+            pass
+
+
+
+    # builds the arrays with the enemies of the new map
+    def setup(self, group):
+        if not self.available:
+            return
+        np = self.np
+        self.group = group
+        self.enemies = [enemy for enemy in group if enemy.movement in self.PATROLS]
+        self.others = [enemy for enemy in group if enemy.movement not in self.PATROLS]
+        enemies = self.enemies
+        for i, enemy in enumerate(enemies):
+            enemy.manager = self
+            enemy.batch_index = i
+
+        def column(attribute, dtype=np.int64):
+            return np.array([getattr(enemy, attribute) for enemy in enemies], dtype=dtype)
+
+        self.x, self.y = column('x'), column('y') # last calculated positions
+        self.x1, self.y1 = column('x1'), column('y1')
+        self.x2, self.y2 = column('x2'), column('y2')
+        self.spawn_tick = column('_spawn_tick')
+        self.alive = ~column('is_dead', bool)
+        self.animation_speed = column('animation_speed')
+        self.frame_index = column('frame_index')
+        self.frame_count = np.array([len(enemy.image_list) for enemy in enemies], dtype=np.int64)
+        self.width = np.array([enemy.rect.width for enemy in enemies], dtype=np.int64)
+        self.height = np.array([enemy.rect.height for enemy in enemies], dtype=np.int64)
+        self.cells = self._get_cells(self.x, self.y, self.width, self.height) # cells of the collision index
+        movement = column('movement')
+        self._horizontal = np.flatnonzero(movement == enums.EM_HORIZONTAL)
+        self._vertical = np.flatnonzero(movement == enums.EM_VERTICAL)
+        self._horizontal_loop = np.flatnonzero(movement == enums.EM_HORIZONTAL_LOOP)
+        self._vertical_loop = np.flatnonzero(movement == enums.EM_VERTICAL_LOOP)
+
+
+
+    # one logic step of all the enemies
+    def update(self, player, camera):
+        np = self.np
+        group = self.group
+        for enemy in self.others:
+            enemy.update(camera)
+            group.relocate(enemy)
+        if not self.enemies:
+            return
+
+        # visible and near the player before moving (as in Enemy.update)
+        old_x, old_y = self.x, self.y
+        visible = self._get_visible(old_x, old_y, camera)
+        tile_size = constants.TILE_SIZE
+        near = np.maximum(
+            np.abs((old_x + self.width // 2) // tile_size - player.rect.centerx // tile_size),
+            np.abs((old_y + self.height // 2) // tile_size - player.rect.centery // tile_size)
+        ) <= constants.ENEMY_LOD_DISTANCE
+
+        # patrols (see Enemy._set_*_position), the dead enemies do not move
+        steps = self.game.tick - self.spawn_tick
+        x, y = old_x.copy(), old_y.copy()
+        i = self._horizontal
+        x[i] = self._bounce(self.x1[i], self.x2[i], steps[i])
+        i = self._vertical
+        y[i] = self._bounce(self.y1[i], self.y2[i], steps[i])
+        i = self._horizontal_loop
+        period = -((self.x1[i] - self.x2[i]) // 2)
+        x[i] = np.where(period <= 0, self.x2[i],
+                        self.x2[i] - 2 * ((steps[i] - 1) % np.maximum(period, 1)))
+        i = self._vertical_loop
+        period = -((self.y1[i] - self.y2[i]) // 2)
+        y[i] = np.where(period <= 0, self.y1[i],
+                        self.y1[i] + 2 * (steps[i] % np.maximum(period, 1)))
+        alive = self.alive
+        x = np.where(alive, x, old_x)
+        y = np.where(alive, y, old_y)
+        self.x, self.y = x, y
+
+        # animation of the visible enemies (see Enemy.animate)
+        animated = alive & visible
+        self.frame_index = np.where(animated, steps // self.animation_speed % self.frame_count,
+                                    self.frame_index)
+
+        # sprite views that can be seen or touched, or that change cell
+        cells = self._get_cells(x, y, self.width, self.height)
+        changed = (cells != self.cells).any(axis=1)
+        self.cells = cells
+        update = alive & (visible | near | changed | self._get_visible(x, y, camera))
+        indexes = np.flatnonzero(update).tolist()
+        if not indexes:
+            return
+        enemies = self.enemies
+        old_x, old_y, x, y = old_x.tolist(), old_y.tolist(), x.tolist(), y.tolist()
+        frame_index = self.frame_index.tolist()
+        changed = changed.tolist()
+        for i in indexes:
+            enemy = enemies[i]
+            enemy.prev_x, enemy.prev_y = old_x[i], old_y[i]
+            enemy.x, enemy.y = x[i], y[i]
+            enemy.rect.x, enemy.rect.y = x[i], y[i]
+            enemy.hitbox.topleft = (x[i] + enemy._hitbox_offset[0], y[i] + enemy._hitbox_offset[1])
+            if enemy.frame_index != frame_index[i]:
+                enemy.frame_index = frame_index[i]
+                enemy.image = enemy.image_list[enemy.frame_index]
+                enemy.mask = enemy.mask_list[enemy.frame_index]
+            if changed[i]:
+                group.relocate(enemy)
+
+
+
+    # copies the state of an enemy that has died or respawned
+    def sync(self, enemy):
+        i = enemy.batch_index
+        self.alive[i] = not enemy.is_dead
+        self.spawn_tick[i] = enemy._spawn_tick
+        self.x[i], self.y[i] = enemy.x, enemy.y
+        self.frame_index[i] = enemy.frame_index
+        self.cells[i] = self._get_cells(enemy.x, enemy.y, enemy.rect.width, enemy.rect.height)
+        self.group.relocate(enemy)
+
+
+
+    ##### auxiliary functions #####
+
+    # back and forth between start and end (see enemy._bounce)
+    def _bounce(self, start, end, steps):
+        np = self.np
+        length = np.abs(end - start)
+        offset = steps % np.maximum(2 * length, 1)
+        offset = np.where(offset > length, 2 * length - offset, offset)
+        return start + np.sign(end - start) * offset
+
+
+
+    # enemies (partly) within the camera view
+    def _get_visible(self, x, y, camera):
+        screen_width, screen_height = constants.SCREEN_MAP_UNSCALED_SIZE
+        return ((x + self.width > camera.x) & (x < camera.x + screen_width) &
+                (y + self.height > camera.y) & (y < camera.y + screen_height))
+
+
+
+    # cells of the collision index covered by the enemies (x1, y1, x2, y2)
+    def _get_cells(self, x, y, width, height):
+        size = self.group.cell_size
+        return self.np.stack((x // size, y // size,
+                              (x + width - 1) // size, (y + height - 1) // size), axis=-1)
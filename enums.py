@@ -76,3 +76,14 @@ SM_WINDOW, SM_4_3, SM_16_9 = 0, 1, 2
 # difficulties
 DF_EASY, DF_NORMAL, DF_HARD = 0, 1, 2
 
+# player inputs for one logic step (bitmask, 1 byte in the replays)
+# IN_JOYSTICK: direction from the joystick (longer turn delay)
+# IN_ALT: action from the mouse or joystick buttons (alternative RGB effect)
+IN_UP, IN_DOWN, IN_LEFT, IN_RIGHT, IN_FIRE, IN_BEACON, IN_JOYSTICK, IN_ALT = 1, 2, 4, 8, 16, 32, 64, 128
+
+# enterable neighbours of a tile (navigation bitmask)
+NB_UP, NB_RIGHT, NB_DOWN, NB_LEFT = 1, 2, 4, 8
+
+# simulation results (headless mode)
+SR_RUNNING, SR_LEVEL_CLEARED, SR_GAME_OVER, SR_GAME_WON = 0, 1, 2, 3
+
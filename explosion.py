@@ -28,11 +28,13 @@ import pygame
 class Explosion(pygame.sprite.Sprite):
     ANIMATION_SPEED = 0.12  # class constant for all explosions
 
-    def __init__(self, pos=None, blast_animation=None):
+    def __init__(self, clock, pos=None, blast_animation=None):
         super().__init__()
+        self.clock = clock # logic steps since the explosion started
         # initialize with default values for pooling
         self.frame_index = 0
         self.frames = None
+        self.start_tick = 0
         self.active = False
         if pos is not None and blast_animation is not None:
             self.initialize(pos, blast_animation)
@@ -43,6 +45,7 @@ class Explosion(pygame.sprite.Sprite):
     def initialize(self, pos, blast_animation):
         self.frame_index = 0
         self.frames = blast_animation
+        self.start_tick = self.clock.get_tick()
         self.image = self.frames[0]
         self.rect = self.image.get_rect(center=pos)
         self.active = True
@@ -53,12 +56,12 @@ class Explosion(pygame.sprite.Sprite):
     def update(self):
         if not self.active:
             return
-        self.frame_index += self.ANIMATION_SPEED
+        self.frame_index = int(self.clock.get_elapsed(self.start_tick) * self.ANIMATION_SPEED)
         if self.frame_index >= len(self.frames): # end of the animation
             self.active = False
             self.kill()  # remove from sprite group
         else:
-            self.image = self.frames[int(self.frame_index)] # next frame
+            self.image = self.frames[self.frame_index] # frame of the current step
 
 
 
@@ -75,9 +78,10 @@ class Explosion(pygame.sprite.Sprite):
 # object pool for explosion instances to reduce memory allocation overhead
 class ExplosionPool:
     
-    def __init__(self, pool_size=10):
+    def __init__(self, clock, pool_size=10):
+        self.clock = clock # animation clock of the game
         # create pool of pre-allocated explosion objects
-        self.available = [Explosion() for _ in range(pool_size)]
+        self.available = [Explosion(clock) for _ in range(pool_size)]
         self.active = []
     
     
@@ -91,7 +95,7 @@ class ExplosionPool:
             return explosion
         else:
             # pool exhausted, create new explosion (fallback)
-            explosion = Explosion(pos, blast_animation)
+            explosion = Explosion(self.clock, pos, blast_animation)
             self.active.append(explosion)
             return explosion
     
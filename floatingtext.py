@@ -1,8 +1,10 @@
 
 # ==============================================================================
 # .::FloatingText class::.
-# Generates a text in the play area with the score obtained (or other data) 
-# that goes up and disappears at the top of the screen.
+# Generates texts in the play area with the score obtained (or other data)
+# that go up and disappear at the top of the screen. Several texts can be
+# shown at the same time; the labels are taken from a pool and the image of
+# each text (with its shadow) is rendered once and cached.
 # ==============================================================================
 #
 #  This file is part of "Mine Squad Pi". Copyright (C) 2025 @salvakantero
@@ -22,52 +24,92 @@
 #
 # ==============================================================================
 
+import pygame
 import constants
 from font import Font
 
 
 
+# one text going up (taken from the pool of FloatingText)
+class FloatingLabel():
+    __slots__ = ('image', 'x', 'y', 'speed')
+
+    def __init__(self):
+        self.image = None
+        self.x = 0
+        self.y = 0
+        self.speed = 0
+
+
+
 class FloatingText():
     ACCELERATION = 0.03  # class constant for upward acceleration
 
-    def __init__(self, surface):
+    def __init__(self, surface, pool_size=8):
         self.font = Font(constants.FNT_PATH + 'small_font.png', constants.PALETTE['WHITE2'], True)
         self.font2 = Font(constants.FNT_PATH + 'small_font.png', constants.PALETTE['BLACK1'], True)
         self.surface = surface
-        self.text = ""
-        self.x = 0
-        self.y = 0
-        self.speed = 0
-        self.active = False
+        # pre-allocated labels
+        self.available = [FloatingLabel() for _ in range(pool_size)]
+        self.active = []
+        self._images = {} # rendered texts (with shadow)
 
 
 
     def show(self, text, x, y):
-        self.text = text
-        self.x = x
-        self.y = y
-        self.speed = 0
-        self.active = True
+        label = self.available.pop() if self.available else FloatingLabel() # (fallback)
+        label.image = self._get_image(text)
+        label.x = x
+        label.y = y
+        label.speed = 0
+        self.active.append(label)
+
+
 
+    # removes all the texts (new map)
+    def clear(self):
+        self.available.extend(self.active)
+        self.active = []
 
 
-    # update the xy position (only if drawn inside the screen)
+
+    # update the xy positions (the texts disappear at the top of the screen)
     def update(self, camera):
         if not self.active:
             return
-        if self.y > camera.y:
-            self.speed += self.ACCELERATION
-            self.y -= self.speed  # decreases Y, goes upwards
-        else:
-            self.active = False
+        still_active = []
+        top = camera.y
+        acceleration = self.ACCELERATION
+        for label in self.active:
+            if label.y > top:
+                label.speed += acceleration
+                label.y -= label.speed  # decreases Y, goes upwards
+                still_active.append(label)
+            else:
+                self.available.append(label)
+        self.active = still_active
 
 
 
-    # draws the text on the screen     
+    # draws the texts on the screen
     def draw(self, camera):
         if not self.active:
-            return            
-        x = self.x - camera.x
-        y = self.y - camera.y        
-        self.font2.render(self.text, self.surface, (x+1, y+1))
-        self.font.render(self.text, self.surface, (x, y))
+            return
+        camera_x, camera_y = camera.x, camera.y
+        self.surface.blits([(label.image, (label.x - camera_x, label.y - camera_y))
+                            for label in self.active], False)
+
+
+
+    ##### auxiliary functions #####
+
+    # image of the text with its shadow (rendered only the first time)
+    def _get_image(self, text):
+        image = self._images.get(text)
+        if image is None:
+            width, height = self.font.get_size(text)
+            image = pygame.Surface((width + 1, height + 1), pygame.SRCALPHA)
+            self.font2.render(text, image, (1, 1))
+            self.font.render(text, image, (0, 0))
+            self._images[text] = image
+        return image
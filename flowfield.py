@@ -0,0 +1,111 @@
+
+# ==============================================================================
+# .::FlowField class::.
+# Distance in steps from every tile of the map to the player's tile, going
+# around the obstacles (breadth-first search). It is shared by all the chasers
+# and only recalculated when the player moves to another tile, so choosing
+# the next tile towards the player is a lookup in the table.
+# ==============================================================================
+#
+#  This file is part of "Mine Squad Pi". Copyright (C) 2026 @salvakantero
+#
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Lesser General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+# ==============================================================================
+
+from collections import deque
+import constants
+import enums
+
+# neighbour bit (NB_*) of each move
+_MOVE_BITS = {(0, -1): enums.NB_UP, (1, 0): enums.NB_RIGHT, (0, 1): enums.NB_DOWN, (-1, 0): enums.NB_LEFT}
+
+
+
+class FlowField():
+    UNREACHABLE = -1
+
+    def __init__(self, map):
+        self.map = map # passable tiles of the current map
+        self.width, self.height = constants.MAP_TILE_SIZE
+        self.distances = [self.UNREACHABLE] * (self.width * self.height)
+        self.origin = None # player's tile used in the last calculation
+
+
+
+    # forgets the current field (new map)
+    def reset(self):
+        self.origin = None
+
+
+
+    # steps from the given tile to the player's tile (UNREACHABLE if there is no way)
+    def get_distance(self, tile_x, tile_y, player_tile):
+        if player_tile != self.origin:
+            self._calculate(player_tile)
+        if 0 <= tile_x < self.width and 0 <= tile_y < self.height:
+            return self.distances[tile_y * self.width + tile_x]
+        return self.UNREACHABLE
+
+
+
+    # next tile towards the player: (dx, dy) of a neighbouring tile one step closer.
+    # Between two valid moves, the axis with the greatest distance to the player wins.
+    # None if the tile is unreachable or already the player's tile.
+    # neighbours: NB_* bitmask of the tiles the enemy can enter
+    def get_direction(self, tile_x, tile_y, player_tile, neighbours=15):
+        distance = self.get_distance(tile_x, tile_y, player_tile)
+        if distance <= 0:
+            return None
+        dx = player_tile[0] - tile_x
+        dy = player_tile[1] - tile_y
+        if abs(dx) > abs(dy):
+            moves = ((1 if dx > 0 else -1, 0), (0, 1 if dy > 0 else -1), (0, -1 if dy > 0 else 1),
+                     (-1 if dx > 0 else 1, 0))
+        else:
+            moves = ((0, 1 if dy > 0 else -1), (1 if dx > 0 else -1, 0), (-1 if dx > 0 else 1, 0),
+                     (0, -1 if dy > 0 else 1))
+        for move_x, move_y in moves:
+            if (neighbours & _MOVE_BITS[move_x, move_y] and
+                self.get_distance(tile_x + move_x, tile_y + move_y, player_tile) == distance - 1):
+                return move_x, move_y
+        return None
+
+
+
+    ##### auxiliary functions #####
+
+    # breadth-first search from the player's tile over the passable tiles
+    def _calculate(self, player_tile):
+        width, height = self.width, self.height
+        passable = self.map.passable
+        distances = self.distances = [self.UNREACHABLE] * (width * height)
+        self.origin = player_tile
+        x, y = player_tile
+        if not (0 <= x < width and 0 <= y < height):
+            return
+        start = y * width + x
+        distances[start] = 0
+        queue = deque((start,))
+        while queue:
+            index = queue.popleft()
+            next_distance = distances[index] + 1
+            x = index % width
+            # neighbours: left, right, up, down (within the map)
+            for neighbour, valid in ((index - 1, x > 0), (index + 1, x < width - 1),
+                                     (index - width, index >= width),
+                                     (index + width, index < (height - 1) * width)):
+                if valid and passable[neighbour] and distances[neighbour] == self.UNREACHABLE:
+                    distances[neighbour] = next_distance
+                    queue.append(neighbour)
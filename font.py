@@ -65,6 +65,23 @@ class Font():
 
 
 
+    # width and height (in pixels) of the rendered text
+    def get_size(self, text):
+        width = x_offset = 0
+        lines = 1
+        for char in text:
+            if char not in ['\n', ' ']:
+                x_offset += self.spacing_dict[char] + self.base_spacing
+            elif char == ' ':
+                x_offset += self.space_width + self.base_spacing
+            else: # line feed
+                lines += 1
+                x_offset = 0
+            width = max(width, x_offset)
+        return width, lines * self.line_height + (lines - 1) * self.line_spacing
+
+
+
     ##### auxiliary functions #####
 
     # change one colour for another
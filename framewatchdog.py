@@ -0,0 +1,126 @@
+
+# ==============================================================================
+# .::FrameWatchdog class::.
+# Detects the frames that exceed the time budget (hitches). While a frame is
+# running late, a background thread samples the stack of the main thread;
+# at the end of the frame the slowest phase and the samples are written to
+# a log file that can be reviewed after the play session.
+# ==============================================================================
+#
+#  This file is part of "Mine Squad Pi". Copyright (C) 2026 @salvakantero
+#
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Lesser General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+# ==============================================================================
+
+import collections
+import os
+import sys
+import threading
+import time
+import traceback
+
+from profiler import Profiler
+
+
+
+class FrameWatchdog():
+    SAMPLE_INTERVAL = 0.004 # seconds between stack samples
+    STACK_DEPTH = 6 # innermost calls kept per sample
+
+    # budget: milliseconds per frame (0 = disabled)
+    def __init__(self, profiler, budget, filename='watchdog.log'):
+        self.profiler = profiler
+        self.budget = budget / 1000
+        self.filename = filename
+        self.enabled = budget > 0
+        self._frame_start = None # None = no frame running
+        self._sampling = False # the frame is still being built (not waiting for the screen)
+        self._samples = []
+        self._main_thread = threading.get_ident()
+        if self.enabled:
+            profiler.acquire(self)
+            threading.Thread(target=self._sample, name='frame watchdog', daemon=True).start()
+
+
+
+    # a new frame begins
+    def start_frame(self):
+        if self.enabled:
+            self._samples = []
+            self._frame_start = time.perf_counter()
+            self._sampling = True
+
+
+
+    # the time spent waiting for the player is not part of the frame
+    def skip(self):
+        if self._frame_start is not None:
+            self._frame_start = time.perf_counter()
+            self._sampling = True
+
+
+
+    # the frame has been presented, the rest is waiting for the frame rate
+    def stop_sampling(self):
+        self._sampling = False
+
+
+
+    # the frame has finished (the profiler already has its phases)
+    def end_frame(self, map_number):
+        if self._frame_start is None:
+            return
+        self._frame_start = None
+        self._sampling = False
+        frame = self.profiler.last
+        frame_time = sum(frame)
+        if frame_time > self.budget:
+            self._log(frame, frame_time, self._samples, map_number)
+
+
+
+    ##### auxiliary functions #####
+
+    # background thread: samples the main thread while the frame is late
+    def _sample(self):
+        while True:
+            time.sleep(self.SAMPLE_INTERVAL)
+            start = self._frame_start
+            if not self._sampling or start is None or time.perf_counter() - start <= self.budget:
+                continue
+            frame = sys._current_frames().get(self._main_thread)
+            if frame is not None:
+                self._samples.append(self._describe_stack(frame))
+
+
+
+    # 'file:line function' of the innermost calls, innermost first
+    def _describe_stack(self, frame):
+        stack = traceback.extract_stack(frame, limit=self.STACK_DEPTH)
+        return ' < '.join(f'{os.path.basename(call.filename)}:{call.lineno} {call.name}'
+                          for call in reversed(stack))
+
+
+
+    # one line per slow frame, plus its most frequent stack samples
+    def _log(self, frame, frame_time, samples, map_number):
+        slowest = max(range(len(frame)), key=frame.__getitem__)
+        lines = [f'{time.strftime("%Y-%m-%d %H:%M:%S")} map {map_number} '
+                 f'frame {frame_time * 1000:.1f} ms (budget {self.budget * 1000:.1f}) '
+                 f'slowest {Profiler.PHASES[slowest]} {frame[slowest] * 1000:.1f} ms']
+        for stack, count in collections.Counter(samples).most_common(3):
+            lines.append(f'    {count}x {stack}')
+        with open(self.filename, 'a') as f:
+            f.write('\n'.join(lines) + '\n')
@@ -22,30 +22,83 @@
 # ==============================================================================
 
 import pygame
-import random
 import sys
 import constants
 import enums
 import os
 import pickle
 from datetime import date
+from animationclock import AnimationClock
 from config import Configuration
 from font import Font
+from enemymanager import EnemyManager
 from explosion import ExplosionPool
 from floatingtext import FloatingText
 from hotspot import Hotspot
 from keyboardrgb import KeyboardRGB
+from rng import RNG
+from scheduler import Scheduler
+from shot import ShotPool
+from inputhandler import InputHandler
+from profiler import Profiler
+from framewatchdog import FrameWatchdog
+from profilecapture import ProfileCapture
+from telemetry import Telemetry
+from spatialgroup import SpatialGroup
+from timestep import Timestep
 
 
 
 class Game():
-    def __init__(self):
+    def __init__(self, seed=None, headless=False, frame_budget=None, telemetry=None,
+                 pixel_collisions=None):
         self.clock = pygame.time.Clock() # game clock for FPS and timers
+        # headless mode: no display, no sound and no frame limit (simulations)
+        self.headless = headless
         self.config = Configuration() # read the configuration file to apply the personal settings
         self.config.load()
+        # the logic runs in fixed steps (60 per second), regardless of the frame rate
+        self.timestep = Timestep(constants.FPS, constants.MAX_FRAME_STEPS)
+        self.tick = 0 # logic steps since the start
+        # time per phase of the frame (benchmarks, disabled by default)
+        self.profiler = Profiler()
+        # slow frames log (budget from the command line or the config file, 0 = disabled)
+        if frame_budget is None:
+            frame_budget = self.config.data.get('frame_budget', 0)
+        self.watchdog = FrameWatchdog(self.profiler, 0 if headless else frame_budget)
+        # per-frame metrics (from the command line or the config file)
+        if telemetry is None:
+            telemetry = self.config.data.get('telemetry', False)
+        self.telemetry = Telemetry(self.profiler, telemetry and not headless)
+        # patrolling enemies updated in NumPy arrays (optional, for maps with many enemies)
+        self.enemy_manager = EnemyManager(self, self.config.data.get('batch_enemies', False))
+        # cProfile captures of the live game (F4)
+        self.profile_capture = ProfileCapture()
+        # frame rate limit for the screen (0 = no limit)
+        self.max_fps = self.config.data.get('max_fps', constants.FPS)
+        # pixel-precise collisions between the player, enemies and bullets (masks)
+        if pixel_collisions is None:
+            pixel_collisions = self.config.data.get('pixel_collisions', False)
+        self.pixel_collisions = pixel_collisions
+        # random number streams (seed from the command line, the config file or random)
+        self.rng = RNG(seed if seed is not None else self.config.data.get('seed'))
+        self._rng_shake = self.rng.stream('shake')
+        self._rng_sfx = self.rng.stream('sfx')
+        self._rng_hotspots = self.rng.stream('hotspots')
         self.blast_sequence = 0 # animated sequence upon explosion (if > 0)
-        self.remaining_beacons = 0 # available beacons
-        self.remaining_mines = 0 # mines left (to be deactivated)
+        self._blast_event = None # end of the blast animation (death sequence in progress)
+        # timed events of the game logic (respawns, shield, death sequence)
+        self.scheduler = Scheduler()
+        # frames of the animations (from the logic steps)
+        self.animation_clock = AnimationClock(self)
+        self.respawn_queue = [] # dead enemies whose respawn time has come
+        self.live_enemies = 0 # enemies on the map not waiting to respawn
+        self._remaining_beacons = 0 # available beacons
+        self._remaining_mines = 0 # mines left (to be deactivated)
+        # hotspots on the map by type (HS_*), updated when they are added or picked up
+        self.hotspot_counts = [0] * (enums.HS_COIN + 1)
+        self._game_impossible = False # last result of is_game_impossible()
+        self._game_impossible_dirty = True # beacons, mines or hotspots changed since then
         self.score = 0 # current game score
         self.status = enums.GS_OVER # start from menus
         self.music_status = enums.MS_UNMUTED # Music!
@@ -60,11 +113,12 @@ class Game():
         # default difficulty
         self.selected_difficulty = enums.DF_NORMAL
         # sprite control groups (for update and collision detection)
+        # (enemies and hotspots indexed by tile for the collisions)
         self.sprite_groups = [
             pygame.sprite.Group(),          # [0] explosions
-            pygame.sprite.Group(),          # [1] enemies
-            pygame.sprite.Group(),          # [2] hotspots
-            pygame.sprite.GroupSingle()]    # [3] shot
+            SpatialGroup(),                 # [1] enemies
+            SpatialGroup(),                 # [2] hotspots
+            pygame.sprite.Group()]          # [3] shots
         # display mode and margins (default values)
         self.v_margin = constants.V_MARGIN
         self.h_margin = constants.H_MARGIN
@@ -72,7 +126,10 @@ class Game():
         # main surface
         self.screen = pygame.display.set_mode(self.win_size, 0, 32)
         # change the resolution and display type according to the settings
-        self.apply_display_settings()
+        if headless:
+            self.config.data['screen_mode'] = enums.SM_WINDOW # not saved
+        else:
+            self.apply_display_settings()
 
         # load images and sound effects
         self.beacon_image = self._load_image(constants.SPR_PATH + 'beacon.png')
@@ -116,6 +173,9 @@ class Game():
                 self._load_image(enem_path + 'soldier2_0.png'),
                 self._load_image(enem_path + 'soldier2_1.png')]                               
         }
+        # collision masks of each frame (pixel-precise collisions)
+        self.enemy_masks = {enemy_type: [pygame.mask.from_surface(image) for image in images]
+                            for enemy_type, images in self.enemy_images.items()}
         self.hotspot_images = {
             enums.HS_LIFE: self._load_image(constants.SPR_PATH + 'hotspot0.png'),
             enums.HS_SHIELD: self._load_image(constants.SPR_PATH + 'hotspot1.png'),
@@ -177,18 +237,21 @@ class Game():
             enums.HS_COIN: pygame.mixer.Sound(constants.FX_PATH + 'sfx_coin.wav')}
         # cache sound effects tuple for better performance
         self._blast_sfx_tuple = tuple(self.sfx_blast.values())
-        # modify the XY position of the map on the screen to create 
-        # a shaking effect for a given number of frames (explosions)
+        # modify the XY position of the map on the screen to create
+        # a shaking effect until a given logic step (explosions)
         self.shake = [0, 0]
-        self.shake_timer = 0
+        self.shake_until = 0 # first logic step without shaking
+        self._shake_edges = False # the edges of the map must be cleaned after shaking
         # high scores table
         self.high_scores = []
         self._load_high_scores()
         # create a joystick/joypad/gamepad object
-        self.joystick = self.config.prepare_joystick()
+        self.joystick = None if headless else self.config.prepare_joystick()
+        # keyboard, mouse and joystick as inputs for the logic steps (and replays)
+        self.input = InputHandler(self)
 
         # RGB keyboard for Pi 500+
-        self.keyboard_rgb = KeyboardRGB(self.config.is_pi500plus)
+        self.keyboard_rgb = KeyboardRGB(self.config.is_pi500plus and not headless)
 
         # common fonts. S = small L = large F = foreground B = background
         self.fonts = {
@@ -211,7 +274,9 @@ class Game():
         self.floating_text = FloatingText(self.srf_map)
         
         # create explosion pool
-        self.explosion_pool = ExplosionPool(pool_size=8)
+        self.explosion_pool = ExplosionPool(self.animation_clock, pool_size=8)
+        # create shot pool
+        self.shot_pool = ShotPool(pool_size=max(constants.MAX_SHOTS))
         
         # enemy scores
         self._enemy_scores = {
@@ -244,6 +309,8 @@ class Game():
 
     # wait for a key to be pressed
     def wait_for_key(self):
+        if self.headless: # nobody to press it
+            return
         self.clear_input_buffer()
         while True:
             # joypad buttons
@@ -260,6 +327,7 @@ class Game():
                     break
             else: continue
             break
+        self.skip_waiting_time()
 
 
 
@@ -288,8 +356,72 @@ class Game():
 
 
 
+    # the time waiting for the player is not part of the game (logic, timings)
+    def skip_waiting_time(self):
+        self.timestep.reset()
+        self.profiler.skip()
+        self.watchdog.skip()
+
+
+
+    # a new frame of the game begins (measurements)
+    def start_frame(self):
+        self.profiler.start_frame()
+        self.watchdog.start_frame()
+
+
+
+    # the frame has been presented (measurements)
+    def end_frame(self, player, map_number):
+        self.profiler.end_frame()
+        self.watchdog.end_frame(map_number)
+        self.telemetry.record(self.sprite_groups, self.live_enemies, player, map_number)
+
+
+
+    # milliseconds elapsed for the game logic (counted in logic steps,
+    # so pauses and slow frames do not consume the timers)
+    def get_ticks(self):
+        return self.tick * 1000 // constants.FPS
+
+
+
+    # first logic step in which get_ticks() reaches the given milliseconds
+    def get_step(self, ms):
+        return -(-ms * constants.FPS // 1000)
+
+
+
+    # the logic timers start from zero, without the events of the previous game
+    def reset_clock(self):
+        self.tick = 0
+        self.scheduler.clear()
+        self.respawn_queue.clear()
+        self.blast_sequence = 0
+        self._blast_event = None
+        self.shake_until = 0
+
+
+
+    # shakes the map for the given logic steps (amplitude: [x, y] in pixels)
+    def start_shake(self, amplitude, steps):
+        self.shake = amplitude
+        self.shake_until = self.tick + steps
+
+
+
+    # stops shaking the map and cleans its edges in the next frame
+    def stop_shake(self):
+        self.shake_until = 0
+        self._shake_edges = True
+
+
+
     # exit to the operating system
     def exit(self):
+        self.input.stop() # saves the replay being recorded
+        self.profile_capture.stop() # saves the cProfile capture in progress
+        self.telemetry.flush()
         self.keyboard_rgb.restore_state()
         pygame.quit()
         sys.exit()
@@ -319,6 +451,8 @@ class Game():
 
     # dump and scale surfaces to the screen
     def update_screen(self):
+        if self.headless: # null renderer, no frame rate limit
+            return
         if self.status == enums.GS_OVER:
             # scale the menu
             self.screen.blit(pygame.transform.scale(
@@ -331,18 +465,19 @@ class Game():
                 (self.h_margin, self.v_margin))
                         
             # shake the surface of the map if it has been requested
+            # (until a logic step, so it lasts the same at any frame rate)
             offset = [0,0]
-            if self.shake_timer > 0:
-                if self.shake_timer == 1: # last frame shaken
-                    # it's necessary to clean the edges of the map after shaking
-                    if self.config.data['screen_mode'] == enums.SM_16_9: # 16:9 fullscreen
-                        self.screen.blit(self.img_background, (0,0))
-                    else: # 4:3 fullscreen or windowed mode
-                        self.screen.fill(constants.PALETTE['BLACK0'])
-                else:
-                    offset[0] = random.randint(-self.shake[0], self.shake[0])
-                    offset[1] = random.randint(-self.shake[1], self.shake[1])
-                self.shake_timer -= 1
+            if self.tick < self.shake_until:
+                offset[0] = self._rng_shake.randint(-self.shake[0], self.shake[0])
+                offset[1] = self._rng_shake.randint(-self.shake[1], self.shake[1])
+                self._shake_edges = True
+            elif self._shake_edges: # first frame after shaking
+                # it's necessary to clean the edges of the map after shaking
+                if self.config.data['screen_mode'] == enums.SM_16_9: # 16:9 fullscreen
+                    self.screen.blit(self.img_background, (0,0))
+                else: # 4:3 fullscreen or windowed mode
+                    self.screen.fill(constants.PALETTE['BLACK0'])
+                self._shake_edges = False
             
             # scale the map
             self.screen.blit(pygame.transform.scale(
@@ -351,12 +486,16 @@ class Game():
         
         if self.config.data['scanlines']: self.apply_scanlines()
         pygame.display.flip() # refresh the screen
-        self.clock.tick(60) # 60 FPS
+        self.profiler.mark('present') # the wait below is not part of the frame
+        self.watchdog.stop_sampling()
+        self.clock.tick(self.max_fps) # frame rate limit (60 FPS by default)
 
 
 
     # display a message, darkening the screen
     def message(self, msg1, msg2, darken, muted, opaque, show_info):
+        if self.headless: # nobody to read it
+            return
         # obscure the surface of the map
         if darken:
             self.srf_map.set_alpha(115)
@@ -417,6 +556,7 @@ class Game():
                 if event.type == pygame.QUIT:
                     self.exit()
                 elif event.type == pygame.KEYDOWN:
+                    self.skip_waiting_time()
                     if event.key == pygame.K_ESCAPE:                    
                         return True # back to menu
                     return False # continue game
@@ -426,7 +566,7 @@ class Game():
     # display a 'game over' message and wait
     def over(self):
         self.keyboard_rgb.restore_state()
-        self.shake_timer = 1 # clean the edges
+        self.stop_shake() # clean the edges
         self.message('G a m e  O v e r', 'PRESS ANY KEY', True, True, False, False)
         pygame.mixer.music.set_volume(1)
         pygame.mixer.music.load(constants.MUS_PATH + 'mus_game_over.ogg')
@@ -453,6 +593,68 @@ class Game():
             
 
 
+    # updates the game logic for one step (player, camera, sprites and collisions)
+    # inputs: bitmask of IN_* values (see InputHandler)
+    def update_world(self, player, map_instance, camera, scoreboard, inputs):
+        profiler = self.profiler
+        profiler.mark('input')
+        self.tick += 1
+        player.update(inputs) # update the player position and state
+        self.scheduler.run(self.tick) # timed events due in this step
+        camera.update(player.x, player.y) # update camera position based on player
+
+        # cache frequently accessed objects for better performance
+        sprite_groups = self.sprite_groups
+        # enemies, blasts, shots (the hotspots are only animated when drawn)
+        # (the moving sprites update their cells in the collision index)
+        enemies = sprite_groups[enums.SG_ENEMIES]
+        if self.enemy_manager.available:
+            self.enemy_manager.update(player, camera)
+        else:
+            for enemy in enemies:
+                enemy.update(camera)
+                enemies.relocate(enemy)
+        for shot in sprite_groups[enums.SG_SHOT]: shot.update(camera)
+        sprite_groups[enums.SG_BLASTS].update() # native pygame group update (no parameters needed)
+        self.floating_text.update(camera)
+        # update explosion and shot pools to recycle finished explosions and removed shots
+        self.explosion_pool.update()
+        self.shot_pool.update()
+        profiler.mark('update')
+
+        # collision between player and enemies, mines or hotspots
+        self.check_player_collisions(player, scoreboard, map_instance)
+        # collision between bullets and enemies
+        self.check_bullet_collisions(scoreboard)
+        # regenerate the hotspot to score (if needed)
+        self.regenerate_hotspot(map_instance)
+        # check and respawn dead enemies
+        self.check_enemy_respawn(camera)
+        profiler.mark('collisions')
+
+
+
+    # draws the visible part of the map and the sprites on the map surface
+    # (camera: usually an interpolated view, see Camera.view())
+    def draw_world(self, player, map_instance, camera):
+        profiler = self.profiler
+        map_instance.draw(camera) # visible map area, free of sprites and marks (15x11 tiles)
+        profiler.mark('map')
+        map_instance.draw_mine_data(camera, player) # draw the location of the mines
+        profiler.mark('mines')
+        player.draw(camera) # draw the player
+        # enemies, hotspots, blasts, shots
+        map_surface = self.srf_map
+        sprite_groups = self.sprite_groups
+        for enemy in sprite_groups[enums.SG_ENEMIES]: enemy.draw(map_surface, camera)
+        for hotspot in sprite_groups[enums.SG_HOTSPOT]: hotspot.draw(map_surface, camera)
+        for shot in sprite_groups[enums.SG_SHOT]: shot.draw(map_surface, camera)
+        for blast in sprite_groups[enums.SG_BLASTS]: blast.draw(map_surface, camera)
+        self.floating_text.draw(camera)
+        profiler.mark('sprites')
+
+
+
     # collisions between the player and mines, killer tiles, enemies and hotspots
     def check_player_collisions(self, player, scoreboard, map_instance):
         # player and killer tiles or mines
@@ -465,20 +667,19 @@ class Game():
             tile_type = map_instance.get_tile_type(tile_x, tile_y)
             if tile_type == enums.TT_MINE:
                 # eliminate the mine by setting it to free
-                map_instance.map_data['mines_info'][tile_y][tile_x] = enums.MI_FREE
+                map_instance.clear_mine(tile_x, tile_y)
                 # shake the map
-                self.shake = [10, 6]
-                self.shake_timer = 14
+                self.start_shake([10, 6], 14)
                 # create an explosion at tile center
                 tile_size = constants.TILE_SIZE
                 blast_x = (tile_x * tile_size) + constants.HALF_TILE_SIZE
                 blast_y = (tile_y * tile_size) + constants.TILE_CENTER_OFFSET
                 blast = self.explosion_pool.get_explosion([blast_x, blast_y], self.blast_images[1])
                 self.sprite_groups[enums.SG_BLASTS].add(blast)
-                random.choice(self._blast_sfx_tuple).play()
+                self._rng_sfx.choice(self._blast_sfx_tuple).play()
                 self.keyboard_rgb.effect_mine_explosion()
                 if player.invincible:
-                    player.invincible = False
+                    player.stop_invincibility()
                     player.loses_energy(3)
                 else:
                     player.loses_energy(7)
@@ -490,36 +691,36 @@ class Game():
                 if not player.invincible:
                     self.sfx_death.play()
                     self.keyboard_rgb.effect_enemy_damage()
-                    self.shake = [4, 4]
-                    self.shake_timer = 8
+                    self.start_shake([4, 4], 8)
                     player.loses_energy(1)
                     scoreboard.invalidate()
                 return
     
             # player and enemies
             if not player.invincible:
-                # filter only alive enemies for collisions
-                alive_enemies = [e for e in self.sprite_groups[enums.SG_ENEMIES] if not e.is_dead]
-                for enemy in alive_enemies:
-                    if pygame.sprite.collide_rect_ratio(0.60)(player, enemy):
+                # only the alive enemies near the player
+                for enemy in self.sprite_groups[enums.SG_ENEMIES].query(player.rect):
+                    if not enemy.is_dead and self._sprites_collide(player, enemy):
                         self.sfx_death2.play()
                         self.keyboard_rgb.effect_enemy_damage()
-                        self.shake = [4, 4]
-                        self.shake_timer = 8
+                        self.start_shake([4, 4], 8)
                         player.loses_energy(2)
                         scoreboard.invalidate() # redraws the scoreboard
                         return     
            
-        # player and hotspot
-        collided_hotspots = pygame.sprite.spritecollide(
-            player, self.sprite_groups[enums.SG_HOTSPOT], False, pygame.sprite.collide_rect_ratio(0.60))
+        # player and hotspot (only the hotspots near the player,
+        # at the height of the current step of their up-and-down movement)
+        hitbox = player.hitbox
+        offset = self.animation_clock.get_hotspot_offset()
+        collided_hotspots = [hotspot for hotspot in self.sprite_groups[enums.SG_HOTSPOT].query(hitbox)
+                             if hitbox.colliderect(hotspot.get_hitbox(offset))]
 
         if collided_hotspots:
             hotspot = collided_hotspots[0]  # only the first one on the list, which will be the only one
             self.keyboard_rgb.effect_hotspot()
 
             # create a magic halo
-            blast = self.explosion_pool.get_explosion(hotspot.rect.center, self.blast_images[2])
+            blast = self.explosion_pool.get_explosion(hotspot.get_hitbox(offset).center, self.blast_images[2])
             self.sprite_groups[enums.SG_BLASTS].add(blast)                
             self.sfx_hotspot[hotspot.type].play()
             
@@ -531,8 +732,7 @@ class Game():
                 player.energy, _ = player.set_player_attributes()
             elif hotspot.type == enums.HS_SHIELD:
                 ftext = 'Shield'
-                player.invincible = True
-                player.timer_from = pygame.time.get_ticks()         
+                player.start_shield()
             elif hotspot.type == enums.HS_AMMO:
                 ftext = 'Ammo +10'
                 player.ammo = min(player.ammo + constants.AMMO_ROUND, constants.MAX_AMMO)
@@ -563,79 +763,170 @@ class Game():
                 hotspot.tile_x * constants.TILE_SIZE, 
                 hotspot.tile_y * constants.TILE_SIZE)
             
-            hotspot.kill() # remove the collided hotspot                                    
+            self.remove_hotspot(hotspot, map_instance) # remove the collided hotspot
             return
 
 
 
     def check_bullet_collisions(self, scoreboard):
         # bullets and enemies
-        shot_sprite = self.sprite_groups[enums.SG_SHOT].sprite
-        if shot_sprite is not None:  # still shot in progress
-            enemies_group = self.sprite_groups[enums.SG_ENEMIES]
-            collided_enemies = pygame.sprite.spritecollide(shot_sprite, enemies_group, False)
-
-            # filter only alive enemies
-            alive_collided = [e for e in collided_enemies if not e.is_dead]
-
-            if alive_collided:  # collision detected
-                enemy = alive_collided[0]  # get first collided enemy
-                enemy.health -= 1
-
-                # optimized scoring system using pre-calculated values
-                if enemy.type in self._enemy_scores:
-                    ftext, score = self._enemy_scores[enemy.type]
-                    self.score += score
-                    self.floating_text.show(ftext, enemy.rect.x, enemy.rect.y)
-
-                shot_sprite.kill()  # remove the bullet
-
-                # if it's the last life, the enemy dies
-                if enemy.health == 0:
-                    # shake the map only when enemy dies
-                    self.keyboard_rgb.effect_mine_explosion()
-                    self.shake = [10, 6]
-                    self.shake_timer = 14
-
-                    blast = self.explosion_pool.get_explosion(enemy.rect.center, self.blast_images[0])
-                    self.sprite_groups[enums.SG_BLASTS].add(blast)
-                    # use pre-computed sound effects tuple
-                    random.choice(self._blast_sfx_tuple).play()
-                    # mark as dead instead of permanently removing
-                    enemy.mark_as_dead()
-                else:
-                    self.sfx_hit.play()
+        shots = self.sprite_groups[enums.SG_SHOT].sprites()
+        if not shots:  # no shots in progress
+            return
+        # alive enemies near any of the bullets, tested against all of them at once
+        enemies = self.sprite_groups[enums.SG_ENEMIES]
+        candidates = {}
+        for shot in shots:
+            candidates.update(dict.fromkeys(enemies.query(shot.rect)))
+        alive = [enemy for enemy in candidates if not enemy.is_dead]
+        if not alive:
+            return
+        alive_rects = [enemy.rect for enemy in alive]
+        for shot in shots:
+            for index in shot.rect.collidelistall(alive_rects):
+                enemy = alive[index]
+                if enemy.is_dead: # killed by another bullet in this step
+                    continue
+                if self.pixel_collisions and pygame.sprite.collide_mask(shot, enemy) is None:
+                    continue
+                shot.kill()  # remove the bullet
+                self._hit_enemy(enemy, scoreboard)
+                break
+
+
+
+    # an enemy hit by a bullet loses one life (and dies with the last one)
+    def _hit_enemy(self, enemy, scoreboard):
+        enemy.health -= 1
+
+        # optimized scoring system using pre-calculated values
+        if enemy.type in self._enemy_scores:
+            ftext, score = self._enemy_scores[enemy.type]
+            self.score += score
+            self.floating_text.show(ftext, enemy.rect.x, enemy.rect.y)
+
+        # if it's the last life, the enemy dies
+        if enemy.health == 0:
+            # shake the map only when enemy dies
+            self.keyboard_rgb.effect_mine_explosion()
+            self.start_shake([10, 6], 14)
+
+            blast = self.explosion_pool.get_explosion(enemy.rect.center, self.blast_images[0])
+            self.sprite_groups[enums.SG_BLASTS].add(blast)
+            # use pre-computed sound effects tuple
+            self._rng_sfx.choice(self._blast_sfx_tuple).play()
+            # mark as dead instead of permanently removing
+            enemy.mark_as_dead()
+        else:
+            self.sfx_hit.play()
 
-                # redraw the scoreboard
-                scoreboard.invalidate()
+        # redraw the scoreboard
+        scoreboard.invalidate()
 
 
 
-    # check if the game is impossible to complete
-    def is_game_impossible(self):
-        # if we have enough beacons, game is not impossible
-        if self.remaining_beacons >= self.remaining_mines:
+    # collision between the player and an enemy: collision boxes, or the rects
+    # and then the masks of the current frames in the pixel-precise mode
+    def _sprites_collide(self, sprite1, sprite2):
+        if self.pixel_collisions:
+            return (sprite1.rect.colliderect(sprite2.rect) and
+                    pygame.sprite.collide_mask(sprite1, sprite2) is not None)
+        return sprite1.hitbox.colliderect(sprite2.hitbox)
+
+
+
+    # the death sequence has ended (no energy and the blast animation is over)
+    def is_player_dead(self, player):
+        if player.energy > 0:
             return False
+        player.energy = 0
+        if self.blast_sequence == 0: # blast animation completed
+            return True
+        if self._blast_event is None: # first step of the death sequence
+            self._blast_event = self.scheduler.at(self.tick + self.blast_sequence,
+                                                  self._end_blast_sequence)
+        return False
+
+
+
+    # the blast animation of the death sequence is over
+    def _end_blast_sequence(self):
+        self.blast_sequence = 0
+        self._blast_event = None
+
+
+
+    # an enemy has been dead long enough (see Enemy.mark_as_dead)
+    def queue_enemy_respawn(self, enemy):
+        self.respawn_queue.append(enemy)
+
+
+
+    # available beacons and mines left: any change must check again if the game is impossible
+    @property
+    def remaining_beacons(self):
+        return self._remaining_beacons
+
+    @remaining_beacons.setter
+    def remaining_beacons(self, value):
+        self._remaining_beacons = value
+        self._game_impossible_dirty = True
+
+    @property
+    def remaining_mines(self):
+        return self._remaining_mines
 
-        # count available beacon hotspots in the map
-        beacon_hotspots = sum(
-            1 for hotspot in self.sprite_groups[enums.SG_HOTSPOT]
-            if hotspot.type == enums.HS_BEACON)
+    @remaining_mines.setter
+    def remaining_mines(self, value):
+        self._remaining_mines = value
+        self._game_impossible_dirty = True
 
-        # calculate potential beacons: current + (beacon_packs * 5)
-        potential_beacons = self.remaining_beacons + (beacon_hotspots * 5)
 
-        # game is impossible if even with all beacon packs we can't mark all mines
-        return potential_beacons < self.remaining_mines
+
+    # adds a hotspot to the map and counts it
+    # (indexed once, its rect covers the whole up-and-down movement)
+    def add_hotspot(self, hotspot):
+        self.sprite_groups[enums.SG_HOTSPOT].add(hotspot)
+        self.hotspot_counts[hotspot.type] += 1
+        self._game_impossible_dirty = True
+
+
+
+    # removes a hotspot picked up by the player and frees its tile
+    def remove_hotspot(self, hotspot, map_instance):
+        hotspot.kill()
+        map_instance.release_tile(hotspot.tile_x, hotspot.tile_y)
+        self.hotspot_counts[hotspot.type] -= 1
+        self._game_impossible_dirty = True
+
+
+
+    # no hotspots on the map (new map)
+    def reset_hotspot_counts(self):
+        self.hotspot_counts = [0] * len(self.hotspot_counts)
+        self._game_impossible_dirty = True
+
+
+
+    # check if the game is impossible to complete
+    # (only calculated again when beacons, mines or hotspots have changed)
+    def is_game_impossible(self):
+        if self._game_impossible_dirty:
+            self._game_impossible_dirty = False
+            # potential beacons: current + (beacon_packs * 5)
+            potential_beacons = self._remaining_beacons + self.hotspot_counts[enums.HS_BEACON] * 5
+            # game is impossible if even with all beacon packs we can't mark all mines
+            self._game_impossible = potential_beacons < self._remaining_mines
+        return self._game_impossible
 
 
 
     # regenerate the hotspot to score (if needed)
     def regenerate_hotspot(self, map_instance):
         # count current score hotspots (CANDY, APPLE, CHOCO, COIN)
-        score_hotspots_count = sum(
-            1 for hotspot in self.sprite_groups[enums.SG_HOTSPOT]
-            if hotspot.type >= enums.HS_CANDY)
+        counts = self.hotspot_counts
+        score_hotspots_count = (counts[enums.HS_CANDY] + counts[enums.HS_APPLE] +
+                                counts[enums.HS_CHOCO] + counts[enums.HS_COIN])
 
         # maintain 2 score hotspots at all times
         hotspots_to_create = 2 - score_hotspots_count
@@ -643,43 +934,46 @@ class Game():
         for _ in range(hotspots_to_create):
             # inverse probabilities: lower value = higher probability
             weights = [40, 30, 20, 10]  # CANDY(40%), APPLE(30%), CHOCO(20%), COIN(10%)
-            type = random.choices([enums.HS_CANDY, enums.HS_APPLE, enums.HS_CHOCO, enums.HS_COIN],
-                                  weights=weights)[0]
-            new_hotspot = Hotspot(type, self.hotspot_images[type], map_instance)
-            self.sprite_groups[enums.SG_HOTSPOT].add(new_hotspot)
+            type = self._rng_hotspots.choices([enums.HS_CANDY, enums.HS_APPLE, enums.HS_CHOCO, enums.HS_COIN],
+                                                weights=weights)[0]
+            tile = map_instance.take_free_tile(self._rng_hotspots)
+            if tile is None: # no room left on the map, try again in the next steps
+                break
+            self.add_hotspot(Hotspot(type, self.hotspot_images[type], map_instance, tile))
 
 
 
-    # check and respawn dead enemies after delay
+    # respawn the dead enemies whose time has come (see queue_enemy_respawn)
     def check_enemy_respawn(self, camera):
-        current_time = pygame.time.get_ticks()
-        for enemy in self.sprite_groups[enums.SG_ENEMIES]:
-            if enemy.is_dead:
-                # check if respawn time has elapsed
-                if current_time - enemy.death_time >= enemy.respawn_delay:
-                    # only respawn if player is not too close
-                    if not enemy.is_player_near_respawn():
-                        # calculate respawn position once
-                        spawn_x = enemy.original_data[3] * constants.TILE_SIZE
-                        spawn_y = enemy.original_data[4] * constants.TILE_SIZE
-                        respawn_center = (spawn_x + constants.HALF_TILE_SIZE, spawn_y + constants.HALF_TILE_SIZE)
-
-                        # create a temporary rect at respawn position to check visibility
-                        temp_rect = pygame.Rect(spawn_x, spawn_y, enemy.rect.width, enemy.rect.height)
-                        is_spawn_visible = (
-                            temp_rect.right > camera.x and
-                            temp_rect.left < camera.x + constants.SCREEN_MAP_UNSCALED_SIZE[0] and
-                            temp_rect.bottom > camera.y and
-                            temp_rect.top < camera.y + constants.SCREEN_MAP_UNSCALED_SIZE[1])
-
-                        # only show blast and play FX if the spawn is visible on screen
-                        if is_spawn_visible:
-                            blast = self.explosion_pool.get_explosion(respawn_center, self.blast_images[2])
-                            self.sprite_groups[enums.SG_BLASTS].add(blast)
-                            self.sfx_respawn.play()
-
-                        # respawn the enemy (always, regardless of visibility)
-                        enemy.respawn()
+        if not self.respawn_queue:
+            return
+        waiting = [] # the player is still too close
+        for enemy in self.respawn_queue:
+            if enemy.is_player_near_respawn():
+                waiting.append(enemy)
+                continue
+            # calculate respawn position once
+            spawn_x = enemy.original_data[3] * constants.TILE_SIZE
+            spawn_y = enemy.original_data[4] * constants.TILE_SIZE
+            respawn_center = (spawn_x + constants.HALF_TILE_SIZE, spawn_y + constants.HALF_TILE_SIZE)
+
+            # create a temporary rect at respawn position to check visibility
+            temp_rect = pygame.Rect(spawn_x, spawn_y, enemy.rect.width, enemy.rect.height)
+            is_spawn_visible = (
+                temp_rect.right > camera.x and
+                temp_rect.left < camera.x + constants.SCREEN_MAP_UNSCALED_SIZE[0] and
+                temp_rect.bottom > camera.y and
+                temp_rect.top < camera.y + constants.SCREEN_MAP_UNSCALED_SIZE[1])
+
+            # only show blast and play FX if the spawn is visible on screen
+            if is_spawn_visible:
+                blast = self.explosion_pool.get_explosion(respawn_center, self.blast_images[2])
+                self.sprite_groups[enums.SG_BLASTS].add(blast)
+                self.sfx_respawn.play()
+
+            # respawn the enemy (always, regardless of visibility)
+            enemy.respawn()
+        self.respawn_queue = waiting
 
 
 
@@ -731,7 +1025,7 @@ class Game():
             (1600, 1200),  # UXGA
         ]
         for res in res_4_3:
-            if res in pygame.display.list_modes():
+            if self._is_mode_available(res):
                 self.win_size = res[0], res[1]
                 self.v_margin = (self.win_size[1] - constants.MENU_SCALED_SIZE[1]) // 2
                 self.h_margin = (self.win_size[0] - constants.MENU_SCALED_SIZE[0]) // 2                  
@@ -754,7 +1048,7 @@ class Game():
             (3840, 2160),  # 4K UHD  
         ]
         for res in res_16_9:
-            if res in pygame.display.list_modes():
+            if self._is_mode_available(res):
                 self.win_size = res[0], res[1]
                 self.v_margin = (self.win_size[1] - constants.MENU_SCALED_SIZE[1]) // 2
                 self.h_margin = (self.win_size[0] - constants.MENU_SCALED_SIZE[0]) // 2            
@@ -768,6 +1062,14 @@ class Game():
 
 
 
+    # screen resolution supported by the display
+    # (any resolution without a real display, as in the benchmarks)
+    @staticmethod
+    def _is_mode_available(res):
+        return pygame.display.get_driver() == 'dummy' or res in pygame.display.list_modes()
+
+
+
     # load the high scores table
     def _load_high_scores(self):
         if os.path.exists('scores.dat'):
@@ -1,8 +1,10 @@
 
 # ==============================================================================
 # .::Hotspot class::.
-# Creates a hotspot sprite at random coordinates (is destroyed externally)
-# and animates it with an up-and-down movement.
+# Creates a hotspot sprite on a free tile of the map (is destroyed externally)
+# and animates it with an up-and-down movement. The hotspot never moves in
+# the logic: its rect covers the whole movement, and the height of the
+# current step is read from the animation clock when it is drawn or touched.
 # ==============================================================================
 #
 #  This file is part of "Mine Squad Pi". Copyright (C) 2025 @salvakantero
@@ -24,59 +26,44 @@
 
 import pygame
 import constants
-import enums
-import random
 
 
 
 class Hotspot(pygame.sprite.Sprite):
-    # class constants
-    ANIMATION_TIMER_INIT = 2
-    MAX_Y_OFFSET = 5
-
     # class variable shared by all instances (loaded once)
     _shadow_image = None
 
-    def __init__(self, type, image, map_instance):
+    # tile: (x, y) free tile taken from the map (see Map.take_free_tile)
+    def __init__(self, type, image, map_instance, tile):
         super().__init__()
         self.type = type # LIFE, SHIELD, AMMO, BEACON_PACK, CANDY, APPLE, CHOCOLATE, COIN
-        self.y_offset = 0 # to animate the hotspot (up and down)
-        self.going_up = True
-        self.animation_timer = self.ANIMATION_TIMER_INIT
+        self.clock = map_instance.game.animation_clock # to animate the hotspot (up and down)
         # image
         self.image = image
         # load shadow once for all instances
         if Hotspot._shadow_image is None:
             Hotspot._shadow_image = pygame.image.load(constants.SPR_PATH + 'hotspot_shadow.png').convert_alpha()
         self.shadow_image = Hotspot._shadow_image
-        self.rect = self.image.get_rect()
-        # random coordinates in tiles (have to be converted to pixels)
-        self.tile_x, self.tile_y = self._generate_position(map_instance)
+        # coordinates in tiles (have to be converted to pixels)
+        self.tile_x, self.tile_y = tile
         self.base_y = self.tile_y * constants.TILE_SIZE # pre-calculate base Y position
         self.shadow_y = self.base_y + 1 # shadow is always at the bottom of the tile
-        self.rect.topleft = (self.tile_x * constants.TILE_SIZE, self.base_y)   
+        width, height = self.image.get_size()
+        # collision box (smaller than the image) at the base position
+        # (moved up by the offset of the current step, see get_hitbox)
+        ratio = constants.HOTSPOT_HITBOX_RATIO
+        self.hitbox = pygame.Rect(self.tile_x * constants.TILE_SIZE, self.base_y, width, height).inflate(
+            width * ratio - width, height * ratio - height)
+        # area covered by the whole up-and-down movement (collision index and visibility)
+        max_offset = constants.HOTSPOT_MAX_Y_OFFSET
+        self.rect = pygame.Rect(self.tile_x * constants.TILE_SIZE, self.base_y - max_offset,
+                                width, height + max_offset)
 
 
 
-    def update(self, camera):
-        if not self._is_visible(camera):
-            return
-        # movement (up and down)
-        if self.animation_timer > 1: # time to change the offset
-            self.animation_timer = 0
-            if self.going_up:
-                if self.y_offset < self.MAX_Y_OFFSET:
-                    self.y_offset += 1
-                else:
-                    self.going_up = False
-            else: # going down
-                if self.y_offset > 0:
-                    self.y_offset -= 1
-                else:
-                    self.going_up = True
-        # apply the offset using pre-calculated base_y
-        self.rect.y = self.base_y - self.y_offset
-        self.animation_timer += 1
+    # collision box in the current logic step (offset: see AnimationClock.get_hotspot_offset)
+    def get_hitbox(self, offset):
+        return self.hitbox.move(0, -offset)
 
 
 
@@ -85,7 +72,7 @@ class Hotspot(pygame.sprite.Sprite):
         if not self._is_visible(camera):
             return
         screen_x = self.rect.x - camera.x
-        screen_y = self.rect.y - camera.y
+        screen_y = self.base_y - self.clock.get_hotspot_offset() - camera.y
         screen_shadow_y = self.shadow_y - camera.y
         surface.blit(self.shadow_image, (screen_x, screen_shadow_y))
         surface.blit(self.image, (screen_x, screen_y))
@@ -94,33 +81,6 @@ class Hotspot(pygame.sprite.Sprite):
 
     ##### auxiliary functions #####
 
-    def _generate_position(self, map_instance):
-        max_attempts = 100  # prevent infinite loop
-        rows = constants.MAP_TILE_SIZE[1]
-        cols = constants.MAP_TILE_SIZE[0]
-
-        for _ in range(max_attempts):
-            row = random.randint(0, rows - 1)
-            col = random.randint(0, cols - 1)
-            if map_instance.get_tile_type(col, row) == enums.TT_NO_ACTION:
-                return col, row
-
-        # fallback: build full list if random search fails
-        available_tiles = []
-        for row_index in range(rows):
-            for col_index in range(cols):
-                if map_instance.get_tile_type(col_index, row_index) == enums.TT_NO_ACTION:
-                    available_tiles.append((row_index, col_index))
-
-        if available_tiles:
-            row, col = random.choice(available_tiles)
-            return col, row
-
-        # no available tiles, return a default position (should not happen)
-        return -1, -1
-    
-
-  
     # check if the hotspot is within the camera's view
     def _is_visible(self, camera):
         return (
@@ -0,0 +1,160 @@
+
+# ==============================================================================
+# .::InputHandler class::.
+# Single entry point for keyboard, mouse and joystick during the game.
+# Translates the devices into an IN_* bitmask per logic step, which can be
+# recorded into a replay or taken from one instead of the devices.
+# ==============================================================================
+#
+#  This file is part of "Mine Squad Pi". Copyright (C) 2026 @salvakantero
+#
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Lesser General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+# ==============================================================================
+
+import pygame
+import enums
+
+
+
+class InputHandler():
+    def __init__(self, game):
+        self.game = game # config (keys) and joystick
+        self.pending = 0 # actions (fire, beacon) waiting for the next logic step
+        self.replay = None # replay being recorded or played
+        self.replay_path = None # file where the recording is saved
+        self.recording = False
+        self.playing = False
+        self._play_index = 0 # next step of the replay
+        self._held_buttons = 0 # joystick actions (fire, beacon) held in the last step
+
+
+
+    # processes the events of the frame. Fire and beacon are kept for the
+    # next logic step; the rest of the keys pressed (ESC, mute...) are returned
+    def poll_events(self):
+        keys = []
+        config = self.game.config
+        for event in pygame.event.get():
+            # exit when clicking the X button on the window
+            if event.type == pygame.QUIT:
+                self.game.exit()
+            elif event.type == pygame.KEYDOWN: # a key has been pressed
+                if event.key == config.fire_key:
+                    self.pending |= enums.IN_FIRE
+                elif event.key in (config.beacon_key, config.beacon_key2):
+                    self.pending |= enums.IN_BEACON
+                else:
+                    keys.append(event.key)
+            # mouse clicks
+            elif event.type == pygame.MOUSEBUTTONDOWN:
+                if event.button == 1:  # 1 = left click (fire)
+                    self.pending |= enums.IN_FIRE | enums.IN_ALT
+                elif event.button == 3:  # 3 = right click (beacon)
+                    self.pending |= enums.IN_BEACON | enums.IN_ALT
+        return keys
+
+
+
+    # inputs for the next logic step (from the devices or the replay)
+    def read(self):
+        if self.playing:
+            if self._play_index < len(self.replay):
+                inputs = self.replay.inputs[self._play_index]
+                self._play_index += 1
+                self.pending = 0 # the devices are ignored during the playback
+                return inputs
+            self.playing = False # end of the replay, the player takes control
+        inputs = self.pending | self._read_buttons() | self._read_devices()
+        self.pending = 0
+        if self.recording:
+            self.replay.append(inputs)
+        return inputs
+
+
+
+    # records the inputs of every logic step into the replay
+    def start_recording(self, replay, path):
+        self.stop()
+        self.replay = replay
+        self.replay_path = path
+        self.recording = True
+
+
+
+    # takes the inputs from the replay instead of the devices
+    def start_playback(self, replay):
+        self.stop()
+        self.replay = replay
+        self.playing = True
+        self._play_index = 0
+
+
+
+    # ends the recording (saving the file) or the playback
+    def stop(self):
+        if self.recording:
+            self.replay.save(self.replay_path)
+        self.recording = False
+        self.playing = False
+        self.pending = 0
+        self._held_buttons = 0
+
+
+
+    ##### auxiliary functions #####
+
+    #apply deadzone to joystick axis to eliminate drift
+    @staticmethod
+    def _apply_deadzone(value, threshold=0.1):
+        return value if abs(value) >= threshold else 0.0
+
+
+
+    # joystick actions pressed since the last step (a held button acts only once,
+    # like the keys and mouse buttons, which arrive as events)
+    def _read_buttons(self):
+        joystick = self.game.joystick
+        if joystick is None:
+            return 0
+        held = 0
+        if joystick.get_button(0) or joystick.get_button(1): held |= enums.IN_FIRE
+        if joystick.get_button(2) or joystick.get_button(3): held |= enums.IN_BEACON
+        pressed = held & ~self._held_buttons
+        self._held_buttons = held
+        return pressed | enums.IN_ALT if pressed else 0
+
+
+
+    # directions held right now
+    def _read_devices(self):
+        config = self.game.config
+        joystick = self.game.joystick
+        # keyboard keys (only one direction, in order of priority)
+        key_state = pygame.key.get_pressed()
+        if key_state[config.up_key]: return enums.IN_UP
+        if key_state[config.down_key]: return enums.IN_DOWN
+        if key_state[config.left_key]: return enums.IN_LEFT
+        if key_state[config.right_key]: return enums.IN_RIGHT
+        # check joystick direction if no key is pressed
+        if joystick is not None:
+            # apply dead zone for joystick movement
+            axis_x = self._apply_deadzone(joystick.get_axis(0))
+            axis_y = self._apply_deadzone(joystick.get_axis(1))
+            # determine direction based on axis values
+            if axis_y < -0.5:   return enums.IN_UP | enums.IN_JOYSTICK
+            elif axis_y > 0.5:  return enums.IN_DOWN | enums.IN_JOYSTICK
+            elif axis_x < -0.5: return enums.IN_LEFT | enums.IN_JOYSTICK
+            elif axis_x > 0.5:  return enums.IN_RIGHT | enums.IN_JOYSTICK
+        return 0
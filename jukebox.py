@@ -22,24 +22,24 @@
 # ==============================================================================
 
 import pygame
-import random
 
 
 
 class Jukebox():
     FILE_EXTENSION = '.ogg' # audio file extension
 
-    def __init__(self, path, base_filename, tracks):
+    def __init__(self, path, base_filename, tracks, rng):
         self.track_list = list(range(0, tracks)) # sorted playlist
         self.track_index = 0 # current theme song number
         self.path = path # path to the folder with the music tracks
         self.base_filename = base_filename # common name of the files
+        self.rng = rng # random stream used to shuffle the playlist
 
 
 
     # generates a new random list of the x available tracks
     def shuffle(self):
-        random.shuffle(self.track_list)
+        self.rng.shuffle(self.track_list)
         self.track_index = 0
 
 
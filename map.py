@@ -25,13 +25,14 @@
 
 import pygame
 import json
+import math
 import os
-import random
 import constants
 import enums
 
 from hotspot import Hotspot
 from enemy import Enemy
+from flowfield import FlowField
 
 
 
@@ -62,6 +63,17 @@ class Map():
             surface.fill((0, 0, 0, alpha))
             self._fog_surfaces.append(surface)
         self._fog_surface = self._fog_surfaces[0]
+        # passable tiles (1) and obstacles (0), one byte per tile (row by row)
+        self.passable = bytearray(constants.MAP_TILE_SIZE[0] * constants.MAP_TILE_SIZE[1])
+        # enterable neighbours of each tile (NB_* bitmask) per enemy footprint
+        self.neighbours = {} # (width, height) in tiles -> one byte per tile
+        # free tiles for the hotspots (passable, without mine, beacon or hotspot)
+        self._free_tiles = [] # (x, y), in no particular order
+        self._free_index = {} # (x, y) -> position in _free_tiles
+        # distances to the player's tile, shared by the chasers
+        self.flow_field = FlowField(self)
+        # line of sight between two tiles: {((x1, y1), (x2, y2)): bool}
+        self._sight_cache = {}
 
 
 
@@ -79,16 +91,21 @@ class Map():
         # load the new map
         self._load()
         # reset some vars
-        self.game.floating_text.active = False
+        self.game.floating_text.clear()
         self.game.blast_sequence = 0
         # reset optimization caches
         self._player_tile_cache = (-1, -1)
         self._alpha_cache.clear()
         self._text_surfaces_cache.clear()
+        # pending respawns of the previous enemies
+        for enemy in self.game.sprite_groups[enums.SG_ENEMIES]: enemy.cancel_respawn()
+        self.game.respawn_queue.clear()
         # reset the sprite groups
         for group in self.game.sprite_groups: group.empty()
+        self.game.reset_hotspot_counts()
         # clear explosion pool for new map
         self.game.explosion_pool.clear()
+        self.game.shot_pool.clear()
         # player in its starting position
         player.x, player.y = constants.PLAYER_X_INI, constants.PLAYER_Y_INI
         player.target_x, player.target_y = player.x, player.y
@@ -103,16 +120,21 @@ class Map():
 
         # add the hotspots
         map_hotspots = [hotspot for hotspot in constants.HOTSPOT_DATA if hotspot[1] == self.number]
+        rng = self.game.rng.stream('hotspots')
         for hotspot_data in map_hotspots:
             type = hotspot_data[0] # LIFE, SHIELD, AMMO, BEACON_PACK, CANDY, APPLE, CHOCOLATE, COIN
-            hotspot_sprite = Hotspot(type, self.game.hotspot_images[type], self)
-            self.game.sprite_groups[enums.SG_HOTSPOT].add(hotspot_sprite)
+            tile = self.take_free_tile(rng)
+            if tile is None: # no room left on the map
+                break
+            self.game.add_hotspot(Hotspot(type, self.game.hotspot_images[type], self, tile))
 
         # add enemies to the map reading from 'ENEMIES_DATA' list
         map_enemies = [enemy for enemy in constants.ENEMIES_DATA if enemy[0] == self.number]
         for enemy_data in map_enemies:
             enemy = Enemy(enemy_data, player.rect, self.game.enemy_images[enemy_data[1]], self)
             self.game.sprite_groups[enums.SG_ENEMIES].add(enemy)
+        self.game.live_enemies = len(map_enemies)
+        self.game.enemy_manager.setup(self.game.sprite_groups[enums.SG_ENEMIES])
 
 
 
@@ -221,6 +243,99 @@ class Map():
 
 
 
+    # directions (NB_* bitmask) in which an enemy of the given footprint
+    # can move one tile from the given tile
+    def get_neighbours(self, x, y, footprint):
+        if (0 <= x < constants.MAP_TILE_SIZE[0] and
+            0 <= y < constants.MAP_TILE_SIZE[1]):
+            return self.neighbours[footprint][y * constants.MAP_TILE_SIZE[0] + x]
+        return 0
+
+
+
+    # distance in pixels from the point (x, y), in the direction (dx, dy), to the
+    # first obstacle tile or the edge of the map (0 if the point is already in one).
+    # Goes through the tiles crossed by the ray one by one (DDA)
+    def cast_ray(self, x, y, dx, dy):
+        tile_size = self._tile_size
+        width, height = constants.MAP_TILE_SIZE
+        passable = self.passable
+        length = math.hypot(dx, dy)
+        dx, dy = dx / length, dy / length
+        tile_x, tile_y = int(x // tile_size), int(y // tile_size)
+        # distance along the ray to the next vertical (x) and horizontal (y) tile border,
+        # and between two consecutive borders
+        if dx:
+            step_x = 1 if dx > 0 else -1
+            next_x = ((tile_x + (dx > 0)) * tile_size - x) / dx
+            delta_x = tile_size / abs(dx)
+        else:
+            step_x, next_x, delta_x = 0, math.inf, math.inf
+        if dy:
+            step_y = 1 if dy > 0 else -1
+            next_y = ((tile_y + (dy > 0)) * tile_size - y) / dy
+            delta_y = tile_size / abs(dy)
+        else:
+            step_y, next_y, delta_y = 0, math.inf, math.inf
+        distance = 0.0
+        while 0 <= tile_x < width and 0 <= tile_y < height and passable[tile_y * width + tile_x]:
+            if next_x < next_y:
+                distance = next_x
+                next_x += delta_x
+                tile_x += step_x
+            else:
+                distance = next_y
+                next_y += delta_y
+                tile_y += step_y
+        return distance
+
+
+
+    # no obstacles on the straight line between two tiles (Bresenham), remembered
+    # until the map changes (the oldest results are discarded when the cache is full)
+    def has_line_of_sight(self, from_tile, to_tile):
+        key = (from_tile, to_tile)
+        sight = self._sight_cache.get(key)
+        if sight is None:
+            if len(self._sight_cache) >= constants.SIGHT_CACHE_SIZE:
+                del self._sight_cache[next(iter(self._sight_cache))]
+            sight = self._sight_cache[key] = self._trace_line(from_tile, to_tile)
+        return sight
+
+
+
+    # takes a random free tile (for a hotspot). None if there is none
+    def take_free_tile(self, rng):
+        if not self._free_tiles:
+            return None
+        tile = self._free_tiles[rng.randrange(len(self._free_tiles))]
+        self._remove_free_tile(tile)
+        return tile
+
+
+
+    # gives back a tile taken by a hotspot (picked up)
+    def release_tile(self, x, y):
+        if (x, y) not in self._free_index and self._is_tile_free(x, y):
+            self._free_index[(x, y)] = len(self._free_tiles)
+            self._free_tiles.append((x, y))
+
+
+
+    # the mine of the tile has exploded
+    def clear_mine(self, x, y):
+        self.map_data['mines_info'][y][x] = enums.MI_FREE
+        self.release_tile(x, y)
+
+
+
+    # places a beacon (MI_BEACON or MI_BEACON2) on the tile
+    def set_beacon(self, x, y, value):
+        self.map_data['mines_info'][y][x] = value
+        self._remove_free_tile((x, y))
+
+
+
     def mark_tile(self, x, y):
         # Check bounds
         if 0 <= y < constants.MAP_TILE_SIZE[1] and 0 <= x < constants.MAP_TILE_SIZE[0]:          
@@ -234,6 +349,31 @@ class Map():
 
     ##### auxiliary functions #####
 
+    # goes through the tiles of the line between two tiles (Bresenham) until an obstacle
+    def _trace_line(self, from_tile, to_tile):
+        width, height = constants.MAP_TILE_SIZE
+        passable = self.passable
+        x, y = from_tile
+        x2, y2 = to_tile
+        dx, dy = abs(x2 - x), -abs(y2 - y)
+        step_x = 1 if x < x2 else -1
+        step_y = 1 if y < y2 else -1
+        error = dx + dy
+        while True:
+            if not (0 <= x < width and 0 <= y < height) or not passable[y * width + x]:
+                return False
+            if x == x2 and y == y2:
+                return True
+            error2 = 2 * error
+            if error2 >= dy:
+                error += dy
+                x += step_x
+            if error2 <= dx:
+                error += dx
+                y += step_y
+
+
+
     # updates alpha cache when player position changes
     def _update_alpha_cache(self, player_tile_x, player_tile_y):
         self._alpha_cache.clear()
@@ -296,9 +436,69 @@ class Map():
         # tiles trodden by the player (marked as False by default)
         self.map_data['marks'] = [[False] * constants.MAP_TILE_SIZE[0]
                                 for _ in range(constants.MAP_TILE_SIZE[1])]
+        # obstacles do not change during the level (mines do not block the enemies)
+        self.passable = bytearray(
+            self.get_tile_type(x, y) != enums.TT_OBSTACLE
+            for y in range(constants.MAP_TILE_SIZE[1]) for x in range(constants.MAP_TILE_SIZE[0]))
+        self.flow_field.reset()
+        self._sight_cache.clear()
+        self._free_tiles = [(x, y) for y in range(constants.MAP_TILE_SIZE[1])
+                            for x in range(constants.MAP_TILE_SIZE[0]) if self._is_tile_free(x, y)]
+        self._free_index = {tile: i for i, tile in enumerate(self._free_tiles)}
+        # navigation grid for every enemy size (all the images of a type have the same size)
+        footprints = {(-(-images[0].get_width() // self._tile_size),
+                       -(-images[0].get_height() // self._tile_size))
+                      for images in self.game.enemy_images.values()}
+        self.neighbours = {footprint: self._build_neighbour_masks(footprint)
+                           for footprint in footprints}
+
 
 
 
+    # a hotspot can be placed on the tile
+    def _is_tile_free(self, x, y):
+        return (self.get_tile_type(x, y) == enums.TT_NO_ACTION and
+                self.map_data['mines_info'][y][x] < enums.MI_BEACON)
+
+
+
+    # removes a tile from the free tiles (swapping it with the last one)
+    def _remove_free_tile(self, tile):
+        index = self._free_index.pop(tile, None)
+        if index is None:
+            return
+        last = self._free_tiles.pop()
+        if index < len(self._free_tiles):
+            self._free_tiles[index] = last
+            self._free_index[last] = index
+
+
+
+    # enterable neighbours of every tile for an enemy that covers width x height tiles
+    # (the tile is its top-left corner), computed from the passable tiles
+    def _build_neighbour_masks(self, footprint):
+        map_width, map_height = constants.MAP_TILE_SIZE
+        width, height = footprint
+        passable = self.passable
+        # tiles where the enemy fits without touching an obstacle or leaving the map
+        fits = bytearray(map_width * map_height)
+        for y in range(map_height - height + 1):
+            for x in range(map_width - width + 1):
+                fits[y * map_width + x] = all(passable[(y + j) * map_width + x + i]
+                                              for j in range(height) for i in range(width))
+        masks = bytearray(map_width * map_height)
+        for y in range(map_height):
+            for x in range(map_width):
+                index = y * map_width + x
+                mask = 0
+                if y > 0 and fits[index - map_width]: mask |= enums.NB_UP
+                if x < map_width - 1 and fits[index + 1]: mask |= enums.NB_RIGHT
+                if y < map_height - 1 and fits[index + map_width]: mask |= enums.NB_DOWN
+                if x > 0 and fits[index - 1]: mask |= enums.NB_LEFT
+                masks[index] = mask
+        return masks
+
+
 
     # extracts the tile number from the file name
     def _get_tile_number(self, tile_name):
@@ -319,7 +519,7 @@ class Map():
         mine_data = [[enums.MI_FREE] * constants.MAP_TILE_SIZE[0] 
                     for _ in range(constants.MAP_TILE_SIZE[1])]
         # choose random mine positions among the passable tiles
-        mines = random.sample(available_tiles, constants.NUM_MINES[self.number])
+        mines = self.game.rng.stream('mines').sample(available_tiles, constants.NUM_MINES[self.number])
         for mine in mines:
             row, col = mine
             mine_data[row][col] = enums.MI_MINE # mark the mine
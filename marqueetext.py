@@ -36,11 +36,15 @@ class MarqueeText():
 
 
 
-    # update the xy position
+    # update the xy position (once per logic step)
     def update(self):
-        # draws the text in the new position
         self.x -= self.speed
-        self.font.render(self.text, self.surface, (self.x, self.y))
         # resets when a certain number of pixels are shifted
         if self.x < self._reset_x:
-            self.x = self._surface_width
\ No newline at end of file
+            self.x = self._surface_width
+
+
+
+    # draws the text in the current position
+    def draw(self):
+        self.font.render(self.text, self.surface, (self.x, self.y))
\ No newline at end of file
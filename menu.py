@@ -413,31 +413,36 @@ class Menu():
         selected_option = enums.MO_START # option where the cursor is located
         confirmed_option = False # 'True' when a selected menu item is pressed
         menu_page = 0 # page displayed (0 to 5 automatically. 6 = config page)
-        page_timer = 0 # number of loops the page remains on screen (up to 500)
+        page_timer = 0 # number of logic steps the page remains on screen (up to 500)
         y = -(constants.MENU_UNSCALED_SIZE[1]) # for vertical scrolling of pages
         # refresh the high scores page
         self.page_1()
         # clears the input buffer (keyboard and joystick)
         self.game.clear_input_buffer()
+        self.game.timestep.reset()
 
         # ========================= main menu loop =========================        
         while True:
-            page_timer += 1
+            # timers and scrolls advance in fixed logic steps (60 per second)
+            for _ in range(self.game.timestep.advance()):
+                page_timer += 1
+                # ====== transition of menu pages from top to bottom, and back again ======
+                if page_timer >= 500: # time exceeded?
+                    menu_page += 1 # change the page
+                    if menu_page > 5: menu_page = 0 # back to the main page
+                    page_timer = 0 # and reset the timer
+                    y = -(constants.MENU_UNSCALED_SIZE[1]) # again in the upper margin
+                    selected_option = enums.MO_START
+                elif page_timer >= 470: # time almost exceeded?
+                    y -= 6 # scrolls the page up (is disappearing)
+                elif y < 0: # as long as the page does not reach the upper margin
+                    y += 6 # scrolls the page up (is appearing)
+                # texts of the marquee
+                marquee_help.update()
+                marquee_credits.update()
 
             # draws the background image
             self.srf_menu.blit(self.img_menu, (0,0))
-
-            # ====== transition of menu pages from top to bottom, and back again ======
-            if page_timer >= 500: # time exceeded?
-                menu_page += 1 # change the page
-                if menu_page > 5: menu_page = 0 # back to the main page
-                page_timer = 0 # and reset the timer
-                y = -(constants.MENU_UNSCALED_SIZE[1]) # again in the upper margin
-                selected_option = enums.MO_START
-            elif page_timer >= 470: # time almost exceeded?
-                y -= 6 # scrolls the page up (is disappearing)
-            elif y < 0: # as long as the page does not reach the upper margin
-                y += 6 # scrolls the page up (is appearing)           
             # draw one of the 6 menu pages
             self.srf_menu.blit(self.menu_pages[menu_page], (0, y))
 
@@ -526,6 +531,7 @@ class Menu():
                                 return
                         confirmed_option = False
                         page_timer = 0
+                        self.game.timestep.reset() # time spent in the selection pages
                     # config page
                     elif selected_option == enums.MO_SETTINGS:
                         y = -(constants.MENU_UNSCALED_SIZE[1]) # completely off-screen
@@ -569,8 +575,8 @@ class Menu():
                         self.page_6()
 
             # draws the texts of the marquee in their new position
-            marquee_help.update()
-            marquee_credits.update()  
+            marquee_help.draw()
+            marquee_credits.draw()
 
             self.game.update_screen()
             # next loop...
@@ -22,10 +22,10 @@
 # ==============================================================================
 
 import pygame
+import argparse
 
 import constants
 import enums
-import random
 
 from game import Game
 from camera import Camera
@@ -35,31 +35,73 @@ from intro import Intro
 from menu import Menu
 from player import Player
 from jukebox import Jukebox
-
-
-
-MAX_LEVEL = 8
+from perfoverlay import PerfOverlay
+from replay import Replay
+
+
+
+# command line options
+parser = argparse.ArgumentParser(description='Mine Squad Pi')
+parser.add_argument('--seed', type=int, default=None,
+                    help='random seed for reproducible games (overrides config.dat)')
+parser.add_argument('--record', metavar='FILE',
+                    help='save the inputs of each game to a replay file (the last game is kept)')
+parser.add_argument('--replay', metavar='FILE',
+                    help='play back a replay file instead of the first game')
+parser.add_argument('--frame-budget', type=float, metavar='MS',
+                    help='log the frames slower than this to watchdog.log (overrides config.dat)')
+parser.add_argument('--telemetry', action='store_true', default=None,
+                    help='save per-frame metrics to telemetry.jsonl (overrides config.dat)')
+parser.add_argument('--pixel-collisions', action='store_true', default=None,
+                    help='pixel-precise collisions using the sprite masks (overrides config.dat)')
+args = parser.parse_args()
+# replay to play back (instead of the menu)
+replay = Replay.load(args.replay) if args.replay else None
 
 # initialisation
 pygame.init()
 pygame.mixer.init()
 pygame.mouse.set_visible(False)
 
-game = Game()
+game = Game(args.seed, frame_budget=args.frame_budget, telemetry=args.telemetry,
+            pixel_collisions=args.pixel_collisions)
+pixel_collisions = game.pixel_collisions # chosen collision mode (a replay uses its own)
 camera = Camera()
 scoreboard = Scoreboard(game)
 map = Map(game)
 intro = Intro(game)
 menu = Menu(game)
+perf_overlay = PerfOverlay(game) # F3
 # playlist with the X available tracks
-jukebox = Jukebox(constants.MUS_PATH, 'mus_ingame_', 10)
+jukebox = Jukebox(constants.MUS_PATH, 'mus_ingame_', 10, game.rng.stream('music'))
 
 intro.play() # display the intro sequence
 
 # Main loop
 while True:
     if game.status == enums.GS_OVER: # game not running (menu)
-        menu.show() # display the main menu   
+        game.input.stop() # end of the recording or playback of the previous game
+        game.telemetry.flush() # metrics of the last level played
+        if replay is not None:
+            # same player, difficulty and seed as the recorded game
+            game.selected_player = replay.selected_player
+            game.selected_difficulty = replay.difficulty
+            game.rng.reset(replay.seed)
+            game.pixel_collisions = replay.pixel_collisions
+            game.input.start_playback(replay)
+            first_map = replay.map_number
+            replay = None
+        else:
+            menu.show() # display the main menu   
+            # restart the random streams (same seed = same game)
+            game.rng.reset()
+            first_map = 0
+            game.pixel_collisions = pixel_collisions
+            if args.record:
+                game.input.start_recording(Replay(game.rng.seed, game.selected_player,
+                                                  game.selected_difficulty, first_map,
+                                                  pixel_collisions), args.record)
+        game.reset_clock() # the logic timers start from zero in every game
         # create new unordered playlist with the 12 available music tracks
         pygame.mixer.music.stop()
         jukebox.shuffle()
@@ -69,53 +111,45 @@ while True:
         map.last = -1
         game.remaining_mines = -1
         game.score = 0
-        game.blast_sequence = 0
         game.status = enums.GS_RUNNING
-        map.number = 0
+        map.number = first_map
         # light up control keys on Pi 500+ keyboard
         game.keyboard_rgb.light_control_keys(game.config)
     else: # game running
-        # event management
-        for event in pygame.event.get():
-            # exit when clicking the X button on the window
-            if event.type == pygame.QUIT:
-                game.exit()
-            elif event.type == pygame.KEYDOWN: # a key has been pressed
-                # exit by pressing the ESC key
-                if event.key == pygame.K_ESCAPE:
-                     # stop the music when the game is paused
+        game.start_frame()
+        # event management (fire and beacon are applied in the logic steps)
+        for key in game.input.poll_events():
+            # exit by pressing the ESC key
+            if key == pygame.K_ESCAPE:
+                 # stop the music when the game is paused
+                if game.music_status == enums.MS_UNMUTED:
+                    pygame.mixer.music.pause()
+                if game.confirm_exit():
+                    game.keyboard_rgb.restore_state()
+                    game.status = enums.GS_OVER # return to the main menu
+                else:
+                    # restore the music if the game continues
                     if game.music_status == enums.MS_UNMUTED:
-                        pygame.mixer.music.pause()
-                    if game.confirm_exit():
-                        game.keyboard_rgb.restore_state()
-                        game.status = enums.GS_OVER # return to the main menu
-                    else:
-                        # restore the music if the game continues
-                        if game.music_status == enums.MS_UNMUTED:
-                            pygame.mixer.music.unpause()                            
-                # mute the music, or vice versa    
-                elif event.key == game.config.mute_key:
-                    if game.music_status == enums.MS_MUTED:
-                        game.music_status = enums.MS_UNMUTED
-                        pygame.mixer.music.play()
-                    else:
-                        game.music_status = enums.MS_MUTED
-                        pygame.mixer.music.fadeout(1200)
-                # handle fire and beacon keys
-                elif event.key == game.config.fire_key:
-                    player.fire()
-                elif event.key in (game.config.beacon_key, game.config.beacon_key2):
-                    player.place_beacon()
-                # change the map for testing purposes ###########################################
-                #elif event.key == pygame.K_x:
-                #    map.number += 1
-                #################################################################################
-            # mouse clicks
-            elif event.type == pygame.MOUSEBUTTONDOWN:
-                if event.button == 1:  # 1 = left click (fire)
-                    player.fire()
-                elif event.button == 3:  # 3 = right click (beacon)
-                    player.place_beacon(from_keyboard=False)
+                        pygame.mixer.music.unpause()                            
+            # mute the music, or vice versa    
+            elif key == game.config.mute_key:
+                if game.music_status == enums.MS_MUTED:
+                    game.music_status = enums.MS_UNMUTED
+                    pygame.mixer.music.play()
+                else:
+                    game.music_status = enums.MS_MUTED
+                    pygame.mixer.music.fadeout(1200)
+            # show/hide the performance overlay
+            elif key == pygame.K_F3:
+                perf_overlay.toggle()
+            # start/stop a cProfile capture (saved in the 'profiles' folder)
+            elif key == pygame.K_F4:
+                game.profile_capture.toggle(map.number)
+            # change the map for testing purposes ###########################################
+            #elif key == pygame.K_x:
+            #    map.number += 1
+            #################################################################################
+        game.profiler.mark('input')
 
         # change the map if necessary
         if map.number != map.last:
@@ -124,6 +158,7 @@ while True:
             scoreboard.reset(map.number)
             scoreboard.invalidate()
             scoreboard.update(player)
+            game.profiler.mark('load')
             game.message(map.stage_name1[map.stage],
                          f"{map.stage_name2[map.stage]}. - LEVEL {map.number + 1}",
                          True, False, False, True)
@@ -137,65 +172,44 @@ while True:
         ##########
         # UPDATE #
         ##########
-        player.update() # update the player position and state   
-        camera.update(player.x, player.y) # update camera position based on player    
-        
-        # cache frequently accessed objects for better performance
-        sprite_groups = game.sprite_groups  # cache reference
-        enemies = sprite_groups[enums.SG_ENEMIES]
-        hotspots = sprite_groups[enums.SG_HOTSPOT]
-        shots = sprite_groups[enums.SG_SHOT]
-        blasts = sprite_groups[enums.SG_BLASTS]
-        map_surface = game.srf_map
-        
-        # enemies, hotspots, blasts, shots
-        for enemy in enemies: enemy.update()
-        for hotspot in hotspots: hotspot.update(camera)
-        for shot in shots: shot.update(camera)
-        blasts.update() # use native pygame group update (no parameters needed)
-        game.floating_text.update(camera)
-        # update explosion pool to recycle finished explosions
-        game.explosion_pool.update()
+        # the logic runs in fixed steps, as many as the elapsed time requires
+        level_cleared = game_over = game_impossible = False
+        for _ in range(game.timestep.advance()):
+            # player, camera, enemies, hotspots, shots, blasts and collisions
+            game.update_world(player, map, camera, scoreboard, game.input.read())
+            # map completion (all the mines deactivated or exploded)
+            level_cleared = game.remaining_mines == 0 and player.energy > 0
+            # game over conditions
+            # condition 1: player has no energy
+            game_over = game.is_player_dead(player)
+            # condition 2: impossible to complete (not enough beacons)
+            game_impossible = game.is_game_impossible()
+            if level_cleared or game_over or game_impossible:
+                break
 
         ########
         # DRAW #
-        ########       
-        map.draw(camera) # visible map area, free of sprites and marks (15x11 tiles)        
-        map.draw_mine_data(camera, player) # draw the location of the mines                     
-        player.draw(camera) # draw the player
-        # enemies, hotspots, blasts, shots
-        for enemy in enemies: enemy.draw(map_surface, camera)
-        for hotspot in hotspots: hotspot.draw(map_surface, camera)
-        for shot in shots: shot.draw(map_surface, camera)
-        for blast in blasts: blast.draw(map_surface, camera)
-        game.floating_text.draw(camera)
-
-        # collision between player and enemies, mines or hotspots
-        game.check_player_collisions(player, scoreboard, map)
-        # collision between bullets and enemies
-        game.check_bullet_collisions(scoreboard)
-
-        # regenerate the hotspot to score (if needed)
-        game.regenerate_hotspot(map)
-
-        # check and respawn dead enemies
-        game.check_enemy_respawn(camera)
+        ########
+        # visible map, mine data and sprites (interpolated between logic steps)
+        game.draw_world(player, map, camera.view(game.timestep.alpha))
 
         # update the scoreboard (if needed, needs_updating = True)
         scoreboard.update(player)
+        game.profiler.mark('scoreboard')
 
         # next track in the playlist if the music has been stopped
         if game.music_status == enums.MS_UNMUTED:
             jukebox.update()
+        game.profiler.mark('audio')
 
         # check map completion (9 levels from 0 to 8)
-        if game.remaining_mines == 0 and player.energy > 0:
-            if game.shake_timer > 0:
-                game.shake_timer = 1  # stop screen shake and clean up
+        if level_cleared:
+            game.telemetry.flush()
+            game.stop_shake()  # stop screen shake and clean up
             game.update_screen()
-            if map.number < MAX_LEVEL:
+            if map.number < constants.MAX_LEVEL:
                 # show a random end-of-level message
-                title, message = random.choice(constants.END_LEVEL_MESSAGES)
+                title, message = game.rng.stream('messages').choice(constants.END_LEVEL_MESSAGES)
                 game.message(title, message, True, False, False, False)
                 pygame.mixer.music.load(constants.MUS_PATH + 'mus_new_level.ogg')
                 pygame.mixer.music.set_volume(1)
@@ -205,17 +219,8 @@ while True:
             else:
                 game.win()
 
-        # game over conditions
-        game_over = False
-        # condition 1: player has no energy
-        if player.energy <= 0:
-            player.energy = 0
-            if game.blast_sequence == 0: # blast animation completed
-                game_over = True
-            else:
-                game.blast_sequence -= 1 # blast animation in progress
-        # condition 2: impossible to complete (not enough beacons)
-        if game.is_game_impossible():
+        # game over: impossible to complete (not enough beacons)
+        if game_impossible:
             game.message('Opss!', 'THERE AREN\'T ENOUGH BEACONS!', True, False, False, False)
             game.wait_for_key()
             game_over = True
@@ -226,9 +231,16 @@ while True:
             game.status = enums.GS_OVER
             continue
 
+        # performance data over the map
+        if perf_overlay.visible:
+            perf_overlay.draw(game.srf_map)
+        # red dot while capturing with cProfile
+        if game.profile_capture.running:
+            pygame.draw.circle(game.srf_map, constants.PALETTE['RED1'], (233, 6), 3)
+
         # TEST ZONE ================================================================================
-        #game.fonts[enums.S_B_GREEN].render(str(int(game.clock.get_fps())), game.srf_map, (228, 169))
         #game.fonts[enums.S_B_WHITE].render(str(player.state), game.srf_sboard, (100, 25))
         # ==========================================================================================
         
-        game.update_screen()
\ No newline at end of file
+        game.update_screen()
+        game.end_frame(player, map.number)
\ No newline at end of file
@@ -0,0 +1,107 @@
+
+# ==============================================================================
+# .::PerfOverlay class::.
+# Performance information over the map (F3 to show/hide): FPS, recent frame
+# times, milliseconds per phase of the frame and number of active sprites.
+# The profiler only measures while it is needed.
+# ==============================================================================
+#
+#  This file is part of "Mine Squad Pi". Copyright (C) 2026 @salvakantero
+#
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Lesser General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+# ==============================================================================
+
+import collections
+import pygame
+import constants
+import enums
+
+from profiler import Profiler
+
+
+
+class PerfOverlay():
+    SAMPLES = 60 # frames in the sparkline
+    SPARK_HEIGHT = 12 # pixels for a whole frame at 60 FPS
+    # (label, phase) pairs shown two per line
+    PHASE_LABELS = (('UPD', 'update'), ('COL', 'collisions'), ('MAP', 'map'),
+                    ('MIN', 'mines'), ('SPR', 'sprites'), ('PRE', 'present'))
+
+    def __init__(self, game):
+        self.game = game
+        self.visible = False
+        self.font = game.fonts[enums.S_F_GREEN]
+        self.frame_times = collections.deque([0.0] * self.SAMPLES, maxlen=self.SAMPLES) # ms
+        # translucent background
+        self.background = pygame.Surface((104, 72))
+        self.background.fill(constants.PALETTE['BLACK0'])
+        self.background.set_alpha(170)
+        self._phase_index = {phase: i for i, phase in enumerate(Profiler.PHASES)}
+
+
+
+    # shows or hides the overlay (the profiler works only while needed)
+    def toggle(self):
+        self.visible = not self.visible
+        if self.visible:
+            self.game.profiler.acquire(self)
+        else:
+            self.game.profiler.release(self)
+
+
+
+    # draws the overlay with the data of the last completed frame
+    def draw(self, surface):
+        profiler = self.game.profiler
+        frame = profiler.last
+        frame_ms = sum(frame) * 1000
+        self.frame_times.append(frame_ms)
+        x, y = 2, 2
+        surface.blit(self.background, (x, y))
+        x += 3
+        y += 3
+        self.font.render(f'FPS {self.game.clock.get_fps():.0f}  FRAME {frame_ms:.2f}', surface, (x, y))
+        y += 9
+        self._draw_sparkline(surface, x, y)
+        y += self.SPARK_HEIGHT + 3
+        # milliseconds per phase
+        for i in range(0, len(self.PHASE_LABELS), 2):
+            text = '  '.join(f'{label} {frame[self._phase_index[phase]] * 1000:.2f}'
+                             for label, phase in self.PHASE_LABELS[i:i + 2])
+            self.font.render(text, surface, (x, y))
+            y += 9
+        # active sprites
+        sprite_groups = self.game.sprite_groups
+        self.font.render(f'ENE {len(sprite_groups[enums.SG_ENEMIES])}'
+                         f'  HOT {len(sprite_groups[enums.SG_HOTSPOT])}'
+                         f'  SHO {len(sprite_groups[enums.SG_SHOT])}', surface, (x, y))
+        y += 9
+        self.font.render(f'BLA {len(sprite_groups[enums.SG_BLASTS])}'
+                         f'  EXP {self.game.explosion_pool.get_active_count()}', surface, (x, y))
+        # the time spent here is not part of the measured frame
+        profiler.skip()
+
+
+
+    ##### auxiliary functions #####
+
+    # frame times of the last second (the top is a whole frame at 60 FPS)
+    def _draw_sparkline(self, surface, x, y):
+        frame_budget = 1000 / constants.FPS
+        bottom = y + self.SPARK_HEIGHT
+        pygame.draw.line(surface, constants.PALETTE['DARK_GRAY1'], (x, y), (x + self.SAMPLES, y))
+        points = [(x + i, bottom - min(ms / frame_budget, 1.0) * self.SPARK_HEIGHT)
+                  for i, ms in enumerate(self.frame_times)]
+        pygame.draw.lines(surface, constants.PALETTE['DARK_GREEN2'], False, points)
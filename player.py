@@ -1,7 +1,7 @@
 # ==============================================================================
 # .::Player class::.
-# Create the main sprite and manage keyboard/mouse/joystick control, 
-# movement and animation according to its state.
+# Create the main sprite and apply the inputs of each logic step
+# (see InputHandler), movement and animation according to its state.
 # ==============================================================================
 #
 #  This file is part of "Mine Squad Pi". Copyright (C) 2026 @salvakantero
@@ -25,7 +25,6 @@ import pygame
 import constants
 import enums
 
-from shot import Shot
 
 
 
@@ -35,6 +34,7 @@ class Player(pygame.sprite.Sprite):
         # initialize player position
         # start at the centre of the map, 1/4 from the left and at the bottom
         self.x, self.y = constants.PLAYER_X_INI, constants.PLAYER_Y_INI
+        self.prev_x, self.prev_y = self.x, self.y # previous logic step (interpolation)
         # movement
         self.direction = pygame.math.Vector2(0.0, 0.0) # direction of movement
         self.target_x = self.x
@@ -47,16 +47,22 @@ class Player(pygame.sprite.Sprite):
         self.turn_time = 0 # timestamp when player changed direction
         #animation
         self.frame_index = 0 # frame number
-        self.animation_timer = 0 # timer to change frame
         self.animation_speed = constants.ANIM_SPEED_IDLE # frame dwell time
         # images
         self._load_player_images(game.selected_player)
         self.image = self.image_list[self.state][0] # 1st frame of the animation
+        self.mask = self.mask_list[self.state][0] # collision mask of the frame
         self.rect = pygame.Rect(self.x, self.y, constants.TILE_SIZE, constants.TILE_SIZE)
+        # collision box (smaller than the image), moved along with the rect
+        ratio = constants.PLAYER_HITBOX_RATIO
+        width, height = self.rect.size
+        self.hitbox = self.rect.inflate(width * ratio - width, height * ratio - height)
+        self._hitbox_offset = self.hitbox.x - self.rect.x, self.hitbox.y - self.rect.y
         # invincibility
         self.invincible = False # invincible after losing a life or take a shield
         self.timer_from = 0 # tick number when the shield effect begins
         self.timer_to = constants.TIME_REMAINING # time of shield (40 secs.)        
+        self._invincibility_event = None # end of the invincibility (scheduler)
         # FX sounds
         self.sfx_shot1 = pygame.mixer.Sound(constants.FX_PATH + 'sfx_shot1.wav')
         self.sfx_no_ammo = pygame.mixer.Sound(constants.FX_PATH + 'sfx_no_ammo.wav')
@@ -75,18 +81,24 @@ class Player(pygame.sprite.Sprite):
         self.max_energy = self.energy
         self.ammo = 10
         # cache frequently used values
-        self._direction_mappings = {
-            game.config.up_key: (enums.DI_UP, pygame.math.Vector2(0, -1)),
-            game.config.down_key: (enums.DI_DOWN, pygame.math.Vector2(0, 1)),
-            game.config.left_key: (enums.DI_LEFT, pygame.math.Vector2(-1, 0)),
-            game.config.right_key: (enums.DI_RIGHT, pygame.math.Vector2(1, 0))            
-        }
+        # direction bits of the input bitmask (same priority as the keys)
+        self._direction_bits = (
+            (enums.IN_UP, enums.DI_UP, pygame.math.Vector2(0, -1)),
+            (enums.IN_DOWN, enums.DI_DOWN, pygame.math.Vector2(0, 1)),
+            (enums.IN_LEFT, enums.DI_LEFT, pygame.math.Vector2(-1, 0)),
+            (enums.IN_RIGHT, enums.DI_RIGHT, pygame.math.Vector2(1, 0)))
         self._state_mappings = {
             enums.DI_UP: (enums.PS_IDLE_UP, enums.PS_WALK_UP),
             enums.DI_DOWN: (enums.PS_IDLE_DOWN, enums.PS_WALK_DOWN),
             enums.DI_LEFT: (enums.PS_IDLE_LEFT, enums.PS_WALK_LEFT),
             enums.DI_RIGHT: (enums.PS_IDLE_RIGHT, enums.PS_WALK_RIGHT)
         }
+        # direction and speed of the shots (pixels per logic step)
+        self._shot_directions = {
+            enums.DI_UP: (0, -2),
+            enums.DI_DOWN: (0, 2),
+            enums.DI_LEFT: (-2, 0),
+            enums.DI_RIGHT: (2, 0)}
         # cache frequently used constants for performance
         self._tile_size = constants.TILE_SIZE
         self._half_tile_size = constants.HALF_TILE_SIZE
@@ -114,24 +126,18 @@ class Player(pygame.sprite.Sprite):
     # code for a shot to be fired
     def fire(self):
         if self.ammo > 0:       
-            if not self.game.sprite_groups[enums.SG_SHOT].sprite: # no shots on screen
+            shots = self.game.sprite_groups[enums.SG_SHOT]
+            # room for another shot on screen (depends on the difficulty)
+            if len(shots) < constants.MAX_SHOTS[self.game.selected_difficulty]:
                 # direction of the shot
-                dir_vectors = {
-                    enums.DI_UP: pygame.math.Vector2(0, -2),
-                    enums.DI_DOWN: pygame.math.Vector2(0, 2),
-                    enums.DI_LEFT: pygame.math.Vector2(-2, 0),
-                    enums.DI_RIGHT: pygame.math.Vector2(2, 0) }
-                vector = dir_vectors.get(self.look_at, pygame.math.Vector2(0, -2)) # UP by default
-                # shot creation
-                shot = Shot(self.x, self.y, vector, self.game.srf_map)
-                self.game.sprite_groups[enums.SG_SHOT].add(shot)
+                direction = self._shot_directions.get(self.look_at, (0, -2)) # UP by default
+                # shot taken from the pool
+                shots.add(self.game.shot_pool.get_shot(self.x, self.y, direction, self.map))
                 self.sfx_shot1.play()
                 self.ammo -= 1
                 self.scoreboard.invalidate()
         else: # no bullets
             self.sfx_no_ammo.play()
-        # clears the input buffer (keyboard and joystick)
-        self.game.clear_input_buffer()
 
 
 
@@ -165,19 +171,17 @@ class Player(pygame.sprite.Sprite):
                     self.game.floating_text.show('+125',
                         x * self._tile_size, y * self._tile_size)
                     # place the green beacon
-                    self.map.map_data['mines_info'][y][x] = enums.MI_BEACON
+                    self.map.set_beacon(x, y, enums.MI_BEACON)
                 else:
                     self.sfx_beacon_error.play()
                     # place the red beacon for incorrect placement
-                    self.map.map_data['mines_info'][y][x] = enums.MI_BEACON2
+                    self.map.set_beacon(x, y, enums.MI_BEACON2)
                 self.game.remaining_beacons -= 1
                 self.scoreboard.invalidate()
             else: # if there is a beacon on the tile
                 self.sfx_no_ammo.play()
         else: # out of the map
             self.sfx_no_ammo.play()
-        # clears the input buffer (keyboard and joystick)
-        self.game.clear_input_buffer()
 
 
 
@@ -186,9 +190,25 @@ class Player(pygame.sprite.Sprite):
         if not self.invincible:
             self.energy -= value
             if self.energy >= 0:
-                self.invincible = True
-                self.timer_from = pygame.time.get_ticks()
+                self.timer_from = self.game.get_ticks()
                 self.timer_from -= (constants.TIME_REMAINING - 3000)  # 3 secs.
+                self._start_invincibility()
+
+
+
+    # shield picked up: invincible for the whole time of the shield
+    def start_shield(self):
+        self.timer_from = self.game.get_ticks()
+        self._start_invincibility()
+
+
+
+    # the invincibility ends now (e.g. stepping on a mine)
+    def stop_invincibility(self):
+        if self._invincibility_event is not None:
+            self._invincibility_event.cancel()
+            self._invincibility_event = None
+        self.invincible = False
 
 
 
@@ -263,6 +283,8 @@ class Player(pygame.sprite.Sprite):
             
             self.rect.x = self.x
             self.rect.y = self.y
+            self.hitbox.topleft = (self.rect.x + self._hitbox_offset[0],
+                                   self.rect.y + self._hitbox_offset[1])
 
 
 
@@ -271,24 +293,27 @@ class Player(pygame.sprite.Sprite):
         self.animation_speed = (constants.ANIM_SPEED_IDLE 
                               if self.state <= enums.PS_IDLE_RIGHT 
                               else constants.ANIM_SPEED_WALK)
-        self.animation_timer += 1
-        # exceeded the frame time?
-        if self.animation_timer >= self.animation_speed:
-            self.animation_timer = 0
-            self.frame_index += 1 # next frame
-        # exceeded the number of frames?
-        if self.frame_index >= len(self.image_list[self.state]):
-            self.frame_index = 0 # reset the frame number
+        # frame of the current logic step
+        self.frame_index = self.game.animation_clock.get_frame(
+            len(self.image_list[self.state]), self.animation_speed)
         # assigns the image according to frame, status and direction    
         self.image = self.image_list[self.state][self.frame_index]
+        self.mask = self.mask_list[self.state][self.frame_index]
         # invincible effect (player blinks)
         self._handle_invincibility_effect()
 
 
 
     # updates the player position and state
-    def update(self):
-        self._get_input()
+    # inputs: bitmask of IN_* values for this logic step (see InputHandler)
+    def update(self, inputs):
+        self.prev_x, self.prev_y = self.x, self.y
+        # actions
+        if inputs & enums.IN_FIRE:
+            self.fire()
+        if inputs & enums.IN_BEACON:
+            self.place_beacon(from_keyboard=not inputs & enums.IN_ALT)
+        self._get_input(inputs)
         self._get_state()        
         # only process movement if not already in motion
         if not self.is_moving_to_target:
@@ -296,15 +321,14 @@ class Player(pygame.sprite.Sprite):
             elif self.direction.y != 0: self.move(enums.CA_VERTICAL)        
         self.update_movement()        
         self.animate()
-        self._check_timer()
 
 
 
     # draws the player on the screen
     def draw(self, camera):
         if self.energy > 0: # alive and kicking
-            screen_x = self.x - camera.x
-            screen_y = self.y - camera.y
+            screen_x = camera.lerp(self.prev_x, self.x, camera.alpha) - camera.x
+            screen_y = camera.lerp(self.prev_y, self.y, camera.alpha) - camera.y
             self.game.srf_map.blit(self.image, (screen_x, screen_y))
 
 
@@ -325,55 +349,30 @@ class Player(pygame.sprite.Sprite):
             enums.PS_WALK_RIGHT: ['player14.png', 'player13.png', 'player15.png', 'player13.png'],
         }        
         self.image_list = {}
+        self.mask_list = {} # collision masks (pixel-precise collisions)
         for state, files in image_files.items():
             self.image_list[state] = [pygame.image.load(f"{base_path}{filename}").convert_alpha()
                 for filename in files]
+            self.mask_list[state] = [pygame.mask.from_surface(image) for image in self.image_list[state]]
 
 
 
-    #apply deadzone to joystick axis to eliminate drift
-    @staticmethod
-    def _apply_deadzone(value, threshold=0.1):        
-        return value if abs(value) >= threshold else 0.0
-
-
-
-    def _get_joystick_direction(self):
-        if self.game.joystick is None:
-            return None, pygame.math.Vector2(0, 0)
-        # apply dead zone for joystick movement
-        axis_x = self._apply_deadzone(self.game.joystick.get_axis(0))
-        axis_y = self._apply_deadzone(self.game.joystick.get_axis(1))
-        # determine direction based on axis values
-        if axis_y < -0.5:   return enums.DI_UP, pygame.math.Vector2(0, -1)
-        elif axis_y > 0.5:  return enums.DI_DOWN, pygame.math.Vector2(0, 1)
-        elif axis_x < -0.5: return enums.DI_LEFT, pygame.math.Vector2(-1, 0)
-        elif axis_x > 0.5:  return enums.DI_RIGHT, pygame.math.Vector2(1, 0)
+    # direction from the input bitmask
+    def _get_bits_direction(self, inputs):
+        for bit, look_at, direction_vector in self._direction_bits:
+            if inputs & bit:
+                return look_at, direction_vector
         return None, pygame.math.Vector2(0, 0)
 
 
 
-    # keyboard/mouse/joystick keystroke input
-    def _get_input(self):
+    # direction from the inputs (keyboard, joystick or replay)
+    def _get_input(self, inputs):
         # don't allow direction changes while moving to a target
         if self.is_moving_to_target:
             return
-        # joystick buttons
-        if self.game.joystick is not None:
-            if self.game.joystick.get_button(0) or self.game.joystick.get_button(1):
-                self.fire()
-            if self.game.joystick.get_button(2) or self.game.joystick.get_button(3):
-                self.place_beacon(from_keyboard=False)
-        # keyboard keys
-        key_state = pygame.key.get_pressed()
-        pressed_key = next((k for k in self._direction_mappings if key_state[k]), None)
-        if pressed_key:
-            look_at, direction_vector = self._direction_mappings[pressed_key]
-            from_joystick = False
-        else:
-            # check joystick direction if no key is pressed
-            look_at, direction_vector = self._get_joystick_direction()
-            from_joystick = True
+        look_at, direction_vector = self._get_bits_direction(inputs)
+        from_joystick = bool(inputs & enums.IN_JOYSTICK)
         # no input detected
         if look_at is None:
             self.direction.update(0, 0)
@@ -382,11 +381,11 @@ class Player(pygame.sprite.Sprite):
         if look_at != self.look_at:
             self.look_at = look_at
             self.direction.update(0, 0)
-            self.turn_time = pygame.time.get_ticks()
+            self.turn_time = self.game.get_ticks()
             return
         # wait after turning before allowing movement (longer for joystick)
         wait_time = 225 if from_joystick else 125
-        if pygame.time.get_ticks() - self.turn_time < wait_time:
+        if self.game.get_ticks() - self.turn_time < wait_time:
             return
         # update direction to start moving
         self.direction.update(direction_vector)
@@ -414,11 +413,19 @@ class Player(pygame.sprite.Sprite):
 
 
 
-    # controls the shield time
-    def _check_timer(self):
-        if self.invincible:
-            if (pygame.time.get_ticks() - self.timer_from) >= self.timer_to:
-                self.invincible = False
+    # invincible until timer_from + timer_to (replaces the previous end, if any)
+    def _start_invincibility(self):
+        self.stop_invincibility()
+        self.invincible = True
+        self._invincibility_event = self.game.scheduler.at(
+            self.game.get_step(self.timer_from + self.timer_to), self._end_invincibility)
+
+
+
+    # end of the shield time
+    def _end_invincibility(self):
+        self._invincibility_event = None
+        self.invincible = False
 
 
 
@@ -446,7 +453,7 @@ class Player(pygame.sprite.Sprite):
     def _handle_invincibility_effect(self):
         if self.invincible:
             # use elapsed time since invincibility began
-            elapsed_time = pygame.time.get_ticks() - self.timer_from
+            elapsed_time = self.game.get_ticks() - self.timer_from
             # blink every 133ms (equivalent to 8 frames at 60fps)
             if (elapsed_time // 133) & 1 == 0:
                 self.image.set_alpha(128)  # semi-transparent
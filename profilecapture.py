@@ -0,0 +1,64 @@
+
+# ==============================================================================
+# .::ProfileCapture class::.
+# cProfile capture of the live game, started and stopped with a hotkey (F4).
+# Each capture is saved in the 'profiles' folder as map{n}_{timestamp}.prof
+# (python -m pstats profiles/<file> or snakeviz to inspect it).
+# ==============================================================================
+#
+#  This file is part of "Mine Squad Pi". Copyright (C) 2026 @salvakantero
+#
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Lesser General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+# ==============================================================================
+
+import cProfile
+import os
+import time
+
+
+
+class ProfileCapture():
+    def __init__(self, path='profiles'):
+        self.path = path
+        self.running = False
+        self._profile = None
+        self._map_number = 0 # map where the capture started
+
+
+
+    # starts a capture, or stops and saves the current one
+    def toggle(self, map_number):
+        if self.running:
+            self.stop()
+        else:
+            self._map_number = map_number
+            self._profile = cProfile.Profile()
+            self._profile.enable()
+            self.running = True
+
+
+
+    # stops the capture (if any) and saves it. Returns the file name
+    def stop(self):
+        if not self.running:
+            return None
+        self._profile.disable()
+        self.running = False
+        os.makedirs(self.path, exist_ok=True)
+        filename = os.path.join(self.path,
+            f'map{self._map_number}_{time.strftime("%Y%m%d_%H%M%S")}.prof')
+        self._profile.dump_stats(filename)
+        self._profile = None
+        return filename
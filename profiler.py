@@ -0,0 +1,111 @@
+
+# ==============================================================================
+# .::Profiler class::.
+# Time spent in each phase of a frame (input, update, collisions, drawing
+# and presentation). The game calls mark() at the end of every phase; when
+# the profiler is disabled the marks are ignored at almost no cost.
+# ==============================================================================
+#
+#  This file is part of "Mine Squad Pi". Copyright (C) 2026 @salvakantero
+#
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Lesser General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+# ==============================================================================
+
+import time
+
+
+
+class Profiler():
+    # phases of a frame, in order
+    PHASES = ('load', 'input', 'update', 'collisions', 'map', 'mines', 'sprites',
+              'scoreboard', 'audio', 'present')
+
+    def __init__(self):
+        self.enabled = False # only while someone uses it (overlay, watchdog, benchmark)
+        self._users = set()
+        self.history = None # list of completed frames (if recording)
+        self.last = [0.0] * len(self.PHASES) # last completed frame (seconds per phase)
+        self._frame = [0.0] * len(self.PHASES) # frame in progress
+        self._index = {phase: i for i, phase in enumerate(self.PHASES)}
+        self._active = False # a frame is being measured
+        self._time = 0.0 # end of the previous mark
+
+
+
+    # starts measuring a new frame
+    def start_frame(self):
+        if not self.enabled:
+            return
+        self._frame = [0.0] * len(self.PHASES)
+        self._active = True
+        self._time = time.perf_counter()
+
+
+
+    # the time since the previous mark is added to the given phase
+    def mark(self, phase):
+        if not self._active:
+            return
+        now = time.perf_counter()
+        self._frame[self._index[phase]] += now - self._time
+        self._time = now
+
+
+
+    # the time since the previous mark is not counted (e.g. drawing the profiler data)
+    def skip(self):
+        if self._active:
+            self._time = time.perf_counter()
+
+
+
+    # closes the frame in progress
+    def end_frame(self):
+        if not self._active:
+            return
+        self._active = False
+        self.last = self._frame
+        if self.history is not None:
+            self.history.append(self._frame)
+
+
+
+    # starts measuring on behalf of the given user
+    def acquire(self, user):
+        self._users.add(user)
+        self.enabled = True
+
+
+
+    # stops measuring when nobody else needs it
+    def release(self, user):
+        self._users.discard(user)
+        self.enabled = bool(self._users)
+
+
+
+    # starts keeping all the frames (benchmarks)
+    def record(self):
+        self.acquire(self)
+        self.history = []
+
+
+
+    # stops keeping the frames and returns them
+    def stop_recording(self):
+        history = self.history
+        self.history = None
+        self.release(self)
+        return history
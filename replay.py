@@ -0,0 +1,86 @@
+
+# ==============================================================================
+# .::Replay class::.
+# Inputs of a whole game, one byte per logic step (IN_* bitmask), plus the
+# seed and settings needed to play it back exactly in the same way.
+# Binary file: fixed header followed by the inputs compressed with zlib.
+# ==============================================================================
+#
+#  This file is part of "Mine Squad Pi". Copyright (C) 2026 @salvakantero
+#
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Lesser General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+# ==============================================================================
+
+import struct
+import zlib
+
+
+
+class Replay():
+    MAGIC = b'MSQR'
+    VERSION = 2
+    # magic, version, seed, player, difficulty, first map, number of steps, flags
+    HEADER = struct.Struct('<4sBqBBBIB')
+    HEADER_V1 = struct.Struct('<4sBqBBBI') # without flags
+    # flags: game options that change the result
+    FL_PIXEL_COLLISIONS = 1
+
+    def __init__(self, seed, selected_player, difficulty, map_number=0, pixel_collisions=False):
+        self.seed = seed
+        self.selected_player = selected_player
+        self.difficulty = difficulty
+        self.map_number = map_number
+        self.pixel_collisions = pixel_collisions
+        self.inputs = bytearray() # one IN_* bitmask per logic step
+
+
+
+    # adds the inputs of one logic step
+    def append(self, inputs):
+        self.inputs.append(inputs)
+
+
+
+    def save(self, path):
+        header = self.HEADER.pack(self.MAGIC, self.VERSION, self.seed, self.selected_player,
+                                  self.difficulty, self.map_number, len(self.inputs),
+                                  self.FL_PIXEL_COLLISIONS if self.pixel_collisions else 0)
+        with open(path, 'wb') as f:
+            f.write(header)
+            f.write(zlib.compress(bytes(self.inputs), 9))
+
+
+
+    @classmethod
+    def load(cls, path):
+        with open(path, 'rb') as f:
+            data = f.read()
+        magic, version = struct.unpack_from('<4sB', data)
+        if magic != cls.MAGIC or version not in (1, cls.VERSION):
+            raise ValueError(f'{path} is not a valid replay file')
+        header = cls.HEADER if version == cls.VERSION else cls.HEADER_V1
+        magic, version, seed, selected_player, difficulty, map_number, steps, *flags = \
+            header.unpack_from(data)
+        pixel_collisions = bool(flags and flags[0] & cls.FL_PIXEL_COLLISIONS)
+        replay = cls(seed, selected_player, difficulty, map_number, pixel_collisions)
+        replay.inputs = bytearray(zlib.decompress(data[header.size:]))
+        if len(replay.inputs) != steps:
+            raise ValueError(f'{path} is damaged ({len(replay.inputs)} of {steps} steps)')
+        return replay
+
+
+
+    def __len__(self):
+        return len(self.inputs)
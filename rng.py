@@ -0,0 +1,72 @@
+
+# ==============================================================================
+# .::RNG class::.
+# Random number service for the whole session. Each subsystem draws from
+# its own named stream, so gameplay, screen shake, sound effects and music
+# never disturb each other's sequence and a run can be reproduced from a seed.
+# ==============================================================================
+#
+#  This file is part of "Mine Squad Pi". Copyright (C) 2026 @salvakantero
+#
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Lesser General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+# ==============================================================================
+
+import random
+
+
+
+class RNG():
+    # known streams, created in advance (others are created on demand)
+    STREAMS = ('mines', 'hotspots', 'enemies', 'shake', 'sfx', 'music', 'messages')
+
+    def __init__(self, seed=None):
+        self.fixed_seed = seed # if None, every game gets a new random seed
+        self.seed = None # seed of the current game
+        self._streams = {}
+        self.reset()
+
+
+
+    # restarts all the streams (at the beginning of each game).
+    # Streams are reseeded in place, so cached references remain valid.
+    def reset(self, seed=None):
+        if seed is not None:
+            self.seed = seed
+        elif self.fixed_seed is not None:
+            self.seed = self.fixed_seed
+        else:
+            self.seed = random.SystemRandom().randrange(1 << 32)
+        for name in self.STREAMS:
+            self.stream(name)
+        for name, stream in self._streams.items():
+            stream.seed(self._stream_seed(name))
+
+
+
+    # gets a named stream (an independent random.Random instance)
+    def stream(self, name):
+        stream = self._streams.get(name)
+        if stream is None:
+            stream = self._streams[name] = random.Random(self._stream_seed(name))
+        return stream
+
+
+
+    ##### auxiliary functions #####
+
+    # each stream is seeded from the game seed and its own name,
+    # so the sequence of a stream does not depend on the others.
+    def _stream_seed(self, name):
+        return f'{self.seed}:{name}'
@@ -0,0 +1,82 @@
+
+# ==============================================================================
+# .::Scheduler class::.
+# Timed events of the game logic (respawns, end of the shield, death
+# sequence). Each event is registered with the logic step at which it must
+# happen and kept in a heap, so every step only looks at the events that
+# are due instead of checking the timers of every sprite.
+# ==============================================================================
+#
+#  This file is part of "Mine Squad Pi". Copyright (C) 2026 @salvakantero
+#
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Lesser General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+# ==============================================================================
+
+import heapq
+
+
+
+# event returned by the scheduler, can be cancelled before it happens
+class Event():
+    __slots__ = ('tick', 'callback', 'args', 'cancelled')
+
+    def __init__(self, tick, callback, args):
+        self.tick = tick
+        self.callback = callback
+        self.args = args
+        self.cancelled = False
+
+
+
+    def cancel(self):
+        self.cancelled = True
+
+
+
+class Scheduler():
+    def __init__(self):
+        self._queue = [] # heap of (tick, order, event)
+        self._order = 0 # events of the same step happen in the order they were registered
+
+
+
+    # calls callback(*args) in the given logic step
+    def at(self, tick, callback, *args):
+        event = Event(tick, callback, args)
+        heapq.heappush(self._queue, (tick, self._order, event))
+        self._order += 1
+        return event
+
+
+
+    # runs the events due in the current logic step (or before)
+    def run(self, tick):
+        queue = self._queue
+        while queue and queue[0][0] <= tick:
+            event = heapq.heappop(queue)[2]
+            if not event.cancelled:
+                event.callback(*event.args)
+
+
+
+    # forgets all the events (new game)
+    def clear(self):
+        self._queue.clear()
+
+
+
+    # events waiting (including the cancelled ones not yet discarded)
+    def __len__(self):
+        return len(self._queue)
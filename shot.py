@@ -2,6 +2,8 @@
 # ==============================================================================
 # .::Shot class::.
 # Creates, destroys, and draws during its lifecycle a player-fired projectile.
+# The shots are taken from a pool (several can be on the screen at once), and
+# the distance to the first wall is calculated when they are fired.
 # ==============================================================================
 #
 #  This file is part of "Mine Squad Pi". Copyright (C) 2025 @salvakantero
@@ -22,6 +24,7 @@
 # ==============================================================================
 
 import pygame
+import math
 import constants
 
 
@@ -29,36 +32,54 @@ import constants
 class Shot(pygame.sprite.Sprite):
     # class variable - load bullet image once for all instances
     _bullet_image = None
+    _bullet_mask = None
 
-    def __init__(self, player_x, player_y, vector, srf_map):
+    def __init__(self, player_x=None, player_y=None, direction=None, map=None):
         super().__init__()
-        self.vector = vector # direction and speed
-        self.surface = srf_map # map surface
         # load image only once for all shot instances
         if Shot._bullet_image is None:
             Shot._bullet_image = pygame.image.load(constants.SPR_PATH + 'bullet.png').convert_alpha()
+            Shot._bullet_mask = pygame.mask.from_surface(Shot._bullet_image)
         self.image = Shot._bullet_image
-        self.rect = self.image.get_rect()        
-        # starting position        
+        self.mask = Shot._bullet_mask # pixel-precise collisions
+        self.rect = self.image.get_rect()
+        self.dx, self.dy = 0, 0 # direction and speed
+        self.steps_left = 0 # logic steps before hitting an obstacle or the edge of the map
+        self.prev_x, self.prev_y = self.rect.x, self.rect.y
+        if direction is not None:
+            self.initialize(player_x, player_y, direction, map)
+
+
+
+    # initialize/reset the shot for reuse from pool
+    # direction: (dx, dy) pixels per logic step
+    def initialize(self, player_x, player_y, direction, map):
+        self.dx, self.dy = direction
+        # starting position
         self.rect.x = player_x + (constants.HALF_TILE_SIZE // 2)
         self.rect.y = player_y + (constants.HALF_TILE_SIZE // 2)
-        if vector.x > 0: self.rect.x += constants.TILE_SIZE # right
-        elif vector.x < 0: self.rect.x -= constants.HALF_TILE_SIZE # left
-        elif vector.y < 0: self.rect.y -= constants.HALF_TILE_SIZE # up
-        elif vector.y > 0: self.rect.y += constants.TILE_SIZE # down        
+        if self.dx > 0: self.rect.x += constants.TILE_SIZE # right
+        elif self.dx < 0: self.rect.x -= constants.HALF_TILE_SIZE # left
+        elif self.dy < 0: self.rect.y -= constants.HALF_TILE_SIZE # up
+        elif self.dy > 0: self.rect.y += constants.TILE_SIZE # down
+        # previous logic step (render interpolation)
+        self.prev_x, self.prev_y = self.rect.x, self.rect.y
+        # the walls do not change while the bullet flies
+        self.steps_left = self._get_steps_to_wall(map)
 
 
 
     def update(self, camera):
-        # moves the bullet according to the direction
-        self.rect.move_ip(self.vector)
-        # removes the bullet if it has reached the limits of the map
-        if (self.rect.x < 0 or self.rect.x > constants.MAP_PIXEL_SIZE[0] or
-            self.rect.y < 0 or self.rect.y > constants.MAP_PIXEL_SIZE[1]):
+        self.prev_x, self.prev_y = self.rect.x, self.rect.y
+        # removes the bullet if the next step would go into an obstacle or off the map
+        if self.steps_left <= 0:
             self.kill()
             return
+        # moves the bullet according to the direction
+        self.steps_left -= 1
+        self.rect.move_ip(self.dx, self.dy)
         # if the bullet is no longer visible on screen (camera view), remove it.
-        # (this allows the player to shoot again)
+        # (this allows the player to shoot again, see MAX_SHOTS)
         if not self._is_visible(camera):
             self.kill()
 
@@ -68,14 +89,28 @@ class Shot(pygame.sprite.Sprite):
     def draw(self, surface, camera):
         if not self._is_visible(camera):
             return
-        screen_x = self.rect.x - camera.x
-        screen_y = self.rect.y - camera.y
+        screen_x = camera.lerp(self.prev_x, self.rect.x, camera.alpha) - camera.x
+        screen_y = camera.lerp(self.prev_y, self.rect.y, camera.alpha) - camera.y
         surface.blit(self.image, (screen_x, screen_y))
 
 
 
     ##### auxiliary functions #####
 
+    # steps the bullet can move before any of its pixels enters an obstacle tile.
+    # Rays from the centres of the corner pixels on the front side of the bullet
+    def _get_steps_to_wall(self, map):
+        dx, dy = self.dx, self.dy
+        left, right = self.rect.left + 0.5, self.rect.right - 0.5
+        top, bottom = self.rect.top + 0.5, self.rect.bottom - 0.5
+        corners = [(x, y) for x in (left, right) for y in (top, bottom)
+                   if (dx > 0 and x == right) or (dx < 0 and x == left) or
+                      (dy > 0 and y == bottom) or (dy < 0 and y == top)]
+        distance = min(map.cast_ray(x, y, dx, dy) for x, y in corners)
+        return int(distance // math.hypot(dx, dy))
+
+
+
     def _is_visible(self, camera):
         # Returns True if any part of the bullet rect intersects the camera viewport
         return (
@@ -87,3 +122,56 @@ class Shot(pygame.sprite.Sprite):
             and self.rect.y + self.rect.height > camera.y
             # top edge before camera bottom
             and self.rect.y < camera.y + constants.SCREEN_MAP_UNSCALED_SIZE[1])
+
+
+
+# object pool for the shots (the removed shots are reused)
+class ShotPool:
+
+    def __init__(self, pool_size=4):
+        # create pool of pre-allocated shots
+        self.available = [Shot() for _ in range(pool_size)]
+        self.active = []
+
+
+
+    # get a shot from the pool or create new one if pool is empty
+    def get_shot(self, player_x, player_y, direction, map):
+        if not self.available:
+            self.update() # shots removed since the last update
+        if self.available:
+            shot = self.available.pop()
+            shot.initialize(player_x, player_y, direction, map)
+        else:
+            # pool exhausted, create new shot (fallback)
+            shot = Shot(player_x, player_y, direction, map)
+        self.active.append(shot)
+        return shot
+
+
+
+    # update pool - move the removed shots (no longer in a group) back to available pool
+    def update(self):
+        if not self.active:
+            return
+        still_active = []
+        for shot in self.active:
+            if shot.alive():
+                still_active.append(shot)
+            else:
+                self.available.append(shot)
+        self.active = still_active
+
+
+
+    # clear all shots and return them to the pool
+    def clear(self):
+        for shot in self.active:
+            shot.kill()
+        self.update()
+
+
+
+    # get number of shots on the screen
+    def get_active_count(self):
+        return len(self.active)
@@ -0,0 +1,214 @@
+
+# ==============================================================================
+# .::Simulation class::.
+# Runs the game logic without display, sound or frame rate limit.
+# Used for automated playtesting: each call to step() advances one logic
+# step with the given inputs, as fast as the machine allows.
+# Replays recorded in the game (or here) give exactly the same result.
+# ==============================================================================
+#
+#  This file is part of "Mine Squad Pi". Copyright (C) 2026 @salvakantero
+#
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Lesser General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+# ==============================================================================
+
+import os
+import random
+
+# SDL dummy drivers: no window and a silent audio sink
+# (must be set before pygame is initialised)
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+import pygame
+import constants
+import enums
+
+from game import Game
+from camera import Camera
+from map import Map
+from scoreboard import Scoreboard
+from player import Player
+from replay import Replay
+
+
+
+class Simulation():
+    # headless: False to draw on the dummy video driver (benchmarks)
+    def __init__(self, seed=None, selected_player=enums.PL_BLAZE, difficulty=enums.DF_NORMAL,
+                 headless=True):
+        if not pygame.get_init():
+            pygame.init()
+            pygame.mixer.init()
+        self.game = Game(seed, headless)
+        self.game.selected_player = selected_player
+        self.game.selected_difficulty = difficulty
+        self.camera = Camera()
+        self.scoreboard = Scoreboard(self.game)
+        self.map = Map(self.game)
+        self.player = None
+        self.steps = 0 # logic steps simulated in the current game
+        self.result = enums.SR_GAME_OVER # no game in progress
+        self.replay = None # inputs of the current game (if recording)
+
+
+
+    # starts a new game on the given map
+    # record: keeps the inputs of the game in self.replay
+    def reset(self, map_number=0, seed=None, record=False):
+        game = self.game
+        game.rng.reset(seed)
+        game.reset_clock()
+        self.replay = Replay(game.rng.seed, game.selected_player, game.selected_difficulty,
+                             map_number, game.pixel_collisions) if record else None
+        self.player = Player(game, self.map, self.scoreboard)
+        self.map.last = -1
+        self.map.number = map_number
+        game.remaining_mines = -1
+        game.score = 0
+        game.status = enums.GS_RUNNING
+        self.steps = 0
+        self.result = enums.SR_RUNNING
+        self._change_map()
+
+
+
+    # advances the game one logic step
+    # inputs: bitmask of IN_* values (directions, fire, beacon)
+    def step(self, inputs=0):
+        if self.result in (enums.SR_GAME_OVER, enums.SR_GAME_WON):
+            return self.result # call reset() to play again
+        game, player = self.game, self.player
+        # next map after a cleared level
+        if self.map.number != self.map.last:
+            self._change_map()
+            game.profiler.mark('load')
+
+        self.steps += 1
+        if self.replay is not None:
+            self.replay.append(inputs)
+        # player, camera, enemies, hotspots, shots, blasts and collisions
+        game.update_world(player, self.map, self.camera, self.scoreboard, inputs)
+
+        # map completed
+        if game.remaining_mines == 0 and player.energy > 0:
+            if self.map.number < constants.MAX_LEVEL:
+                self.map.number += 1 # loaded in the next step
+                self.result = enums.SR_LEVEL_CLEARED
+            else:
+                self.result = enums.SR_GAME_WON
+                game.status = enums.GS_OVER
+            return self.result
+        # game over: no energy, or not enough beacons to finish the map
+        if game.is_player_dead(player) or game.is_game_impossible():
+            self.result = enums.SR_GAME_OVER
+            game.status = enums.GS_OVER
+            return self.result
+
+        self.result = enums.SR_RUNNING
+        return self.result
+
+
+
+    # plays a whole replay and returns the final state
+    def play(self, replay):
+        self.game.selected_player = replay.selected_player
+        self.game.selected_difficulty = replay.difficulty
+        self.game.pixel_collisions = replay.pixel_collisions
+        self.reset(replay.map_number, replay.seed)
+        for inputs in replay.inputs:
+            if self.step(inputs) in (enums.SR_GAME_OVER, enums.SR_GAME_WON):
+                break
+        return self.state()
+
+
+
+    # summary of the current state (for playtesting scripts)
+    def state(self):
+        player = self.player
+        return {
+            'map': self.map.number,
+            'step': self.steps,
+            'tile': (int(player.x // constants.TILE_SIZE), int(player.y // constants.TILE_SIZE)),
+            'energy': player.energy,
+            'ammo': player.ammo,
+            'score': self.game.score,
+            'mines': self.game.remaining_mines,
+            'beacons': self.game.remaining_beacons,
+            'enemies': self.game.live_enemies,
+            'result': self.result}
+
+
+
+    ##### auxiliary functions #####
+
+    def _change_map(self):
+        self.map.change(self.player)
+        self.camera.update(self.player.x, self.player.y)
+
+
+
+# random walk with some shots, as an endless sequence of inputs
+def random_walk(seed):
+    policy = random.Random(seed)
+    moves = (enums.IN_UP, enums.IN_DOWN, enums.IN_LEFT, enums.IN_RIGHT, 0)
+    move = 0
+    while True:
+        if policy.random() < 0.02: # keeps the direction for a while
+            move = policy.choice(moves)
+        inputs = move
+        if policy.random() < 0.01:
+            inputs |= enums.IN_FIRE
+        yield inputs
+
+
+
+# measures the speed of the simulation with random inputs
+# python simulation.py --steps 20000 --seed 1 [--record first_game.rpl]
+# or plays a replay and shows the final state
+# python simulation.py --replay game.rpl
+if __name__ == '__main__':
+    import argparse
+    import time
+
+    parser = argparse.ArgumentParser(description='Mine Squad Pi headless simulation')
+    parser.add_argument('--steps', type=int, default=20000, help='logic steps to simulate')
+    parser.add_argument('--seed', type=int, default=1, help='random seed')
+    parser.add_argument('--map', type=int, default=0, help='first map (0-8)')
+    parser.add_argument('--record', help='save the inputs of the first game to this file')
+    parser.add_argument('--replay', help='play this replay file instead')
+    args = parser.parse_args()
+
+    if args.replay:
+        replay = Replay.load(args.replay)
+        print(Simulation().play(replay))
+        raise SystemExit
+
+    simulation = Simulation(args.seed)
+    simulation.reset(args.map, record=bool(args.record))
+    policy = random_walk(args.seed)
+    games = 1
+    start = time.perf_counter()
+    for _ in range(args.steps):
+        if simulation.step(next(policy)) in (enums.SR_GAME_OVER, enums.SR_GAME_WON):
+            if simulation.replay is not None and games == 1:
+                simulation.replay.save(args.record)
+                print(f'first game saved to {args.record}: {simulation.state()}')
+            simulation.reset(args.map)
+            games += 1
+    elapsed = time.perf_counter() - start
+    if simulation.replay is not None and games == 1: # unfinished first game
+        simulation.replay.save(args.record)
+    print(f'{args.steps} steps in {elapsed:.2f}s ({args.steps / elapsed:.0f} steps/s), {games} games')
@@ -0,0 +1,118 @@
+
+# ==============================================================================
+# .::SpatialGroup class::.
+# Sprite group with a uniform grid index (one cell per tile). Each sprite is
+# registered in the cells covered by its rect, so a collision query only
+# looks at the sprites near the given rect instead of the whole group.
+# Adding, killing or emptying keeps the index up to date; the sprites that
+# move must call relocate() afterwards.
+# ==============================================================================
+#
+#  This file is part of "Mine Squad Pi". Copyright (C) 2026 @salvakantero
+#
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Lesser General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+# ==============================================================================
+
+import pygame
+import constants
+
+
+
+class SpatialGroup(pygame.sprite.Group):
+    def __init__(self, cell_size=constants.TILE_SIZE):
+        super().__init__()
+        self.cell_size = cell_size
+        # cell (x, y) -> sprites in that cell. Dictionaries keep the order of
+        # insertion, so the queries always return the sprites in the same order
+        self._cells = {}
+        self._bounds = {} # sprite -> cells covered (x1, y1, x2, y2)
+
+
+
+    # updates the cells of a sprite after moving it
+    def relocate(self, sprite):
+        bounds = self._get_bounds(sprite.rect)
+        if bounds != self._bounds.get(sprite):
+            self._erase(sprite)
+            self._insert(sprite, bounds)
+
+
+
+    # sprites whose cells overlap the given rect (candidates for a collision)
+    def query(self, rect):
+        x1, y1, x2, y2 = self._get_bounds(rect)
+        cells = self._cells
+        if x1 == x2 and y1 == y2: # the usual case, a single cell
+            cell = cells.get((x1, y1))
+            return list(cell) if cell else []
+        found = {}
+        for y in range(y1, y2 + 1):
+            for x in range(x1, x2 + 1):
+                cell = cells.get((x, y))
+                if cell:
+                    found.update(cell)
+        return list(found)
+
+
+
+    ##### pygame.sprite.Group internals #####
+
+    def add_internal(self, sprite, layer=None):
+        super().add_internal(sprite, layer)
+        self._insert(sprite, self._get_bounds(sprite.rect))
+
+
+
+    def remove_internal(self, sprite):
+        super().remove_internal(sprite)
+        self._erase(sprite)
+
+
+
+    ##### auxiliary functions #####
+
+    # cells covered by a rect
+    def _get_bounds(self, rect):
+        size = self.cell_size
+        return (rect.left // size, rect.top // size,
+                (rect.right - 1) // size, (rect.bottom - 1) // size)
+
+
+
+    def _insert(self, sprite, bounds):
+        self._bounds[sprite] = bounds
+        x1, y1, x2, y2 = bounds
+        cells = self._cells
+        for y in range(y1, y2 + 1):
+            for x in range(x1, x2 + 1):
+                cell = cells.get((x, y))
+                if cell is None:
+                    cell = cells[(x, y)] = {}
+                cell[sprite] = None
+
+
+
+    def _erase(self, sprite):
+        bounds = self._bounds.pop(sprite, None)
+        if bounds is None:
+            return
+        x1, y1, x2, y2 = bounds
+        cells = self._cells
+        for y in range(y1, y2 + 1):
+            for x in range(x1, x2 + 1):
+                cell = cells[(x, y)]
+                del cell[sprite]
+                if not cell:
+                    del cells[(x, y)]
@@ -0,0 +1,109 @@
+
+# ==============================================================================
+# .::Telemetry class::.
+# Per-frame metrics (frame and phase times, sprites, player tile) kept in a
+# preallocated ring buffer of fixed-size records, so recording a frame does
+# not create lists or dictionaries. The buffer is written to a JSONL file at
+# the end of each level and when leaving the game, one line per frame.
+# ==============================================================================
+#
+#  This file is part of "Mine Squad Pi". Copyright (C) 2026 @salvakantero
+#
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Lesser General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+# ==============================================================================
+
+import array
+import json
+import platform
+import time
+import pygame
+import constants
+import enums
+
+from profiler import Profiler
+
+
+
+class Telemetry():
+    # fields of a record: frame time, time per phase (ms), live enemies (not waiting to
+    # respawn, see Game.live_enemies), hotspots, player tile and map
+    FIELDS = ('frame',) + Profiler.PHASES + ('enemies', 'hotspots', 'tile_x', 'tile_y', 'map_number')
+    RECORD_SIZE = len(FIELDS)
+
+    def __init__(self, profiler, enabled, capacity=3600, filename='telemetry.jsonl'):
+        self.profiler = profiler
+        self.enabled = enabled
+        self.capacity = capacity # frames kept between flushes (1 minute at 60 FPS)
+        self.filename = filename
+        self.session = time.strftime('%Y%m%d_%H%M%S') # to separate the runs in the file
+        self.count = 0 # records in the buffer
+        self.dropped = 0 # oldest records overwritten since the last flush
+        self._next = 0 # position of the next record
+        self._header_written = False
+        if enabled:
+            self._buffer = array.array('d', bytes(8 * capacity * self.RECORD_SIZE))
+            profiler.acquire(self)
+
+
+
+    # stores the last completed frame
+    def record(self, sprite_groups, live_enemies, player, map_number):
+        if not self.enabled:
+            return
+        buffer = self._buffer
+        base = self._next * self.RECORD_SIZE
+        i = base + 1
+        total = 0.0
+        for phase_time in self.profiler.last:
+            total += phase_time
+            buffer[i] = phase_time * 1000
+            i += 1
+        buffer[base] = total * 1000
+        buffer[i] = live_enemies
+        buffer[i + 1] = len(sprite_groups[enums.SG_HOTSPOT])
+        buffer[i + 2] = player.x // constants.TILE_SIZE
+        buffer[i + 3] = player.y // constants.TILE_SIZE
+        buffer[i + 4] = map_number
+        self._next = (self._next + 1) % self.capacity
+        if self.count < self.capacity:
+            self.count += 1
+        else:
+            self.dropped += 1
+
+
+
+    # appends the stored frames to the file and empties the buffer
+    def flush(self):
+        if not self.enabled or self.count == 0:
+            return
+        with open(self.filename, 'a') as f:
+            if not self._header_written:
+                f.write(json.dumps({'session': self.session, 'machine': platform.machine(),
+                                    'python': platform.python_version(),
+                                    'pygame': pygame.version.ver}) + '\n')
+                self._header_written = True
+            if self.dropped:
+                f.write(json.dumps({'session': self.session, 'dropped': self.dropped}) + '\n')
+            first = (self._next - self.count) % self.capacity
+            for n in range(self.count):
+                base = ((first + n) % self.capacity) * self.RECORD_SIZE
+                record = {'session': self.session}
+                for i, field in enumerate(self.FIELDS):
+                    value = self._buffer[base + i]
+                    record[field] = round(value, 3) if i <= len(Profiler.PHASES) else int(value)
+                f.write(json.dumps(record) + '\n')
+        self.count = 0
+        self.dropped = 0
+        self._next = 0
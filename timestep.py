@@ -0,0 +1,62 @@
+
+# ==============================================================================
+# .::Timestep class::.
+# Fixed time step for the game logic. The real time elapsed between frames
+# is accumulated and converted into a whole number of logic steps, so the
+# game runs at the same speed whatever the frame rate of the screen.
+# The remainder is used to interpolate the positions when drawing.
+# ==============================================================================
+#
+#  This file is part of "Mine Squad Pi". Copyright (C) 2026 @salvakantero
+#
+#  This program is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Lesser General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+# ==============================================================================
+
+import time
+
+
+
+class Timestep():
+    def __init__(self, steps_per_second, max_steps):
+        self.step_time = 1.0 / steps_per_second # seconds per logic step
+        self.max_steps = max_steps # limit per frame (avoids the spiral of death)
+        self.accumulator = 0.0 # real time not yet simulated
+        self.alpha = 0.0 # fraction of the next step already elapsed (0..1)
+        self._last_time = time.perf_counter()
+
+
+
+    # number of logic steps to run in this frame
+    def advance(self):
+        now = time.perf_counter()
+        self.accumulator += now - self._last_time
+        self._last_time = now
+        steps = int(self.accumulator / self.step_time)
+        if steps > self.max_steps:
+            # too slow to catch up, the game slows down instead
+            steps = self.max_steps
+            self.accumulator = 0.0
+        else:
+            self.accumulator -= steps * self.step_time
+        self.alpha = self.accumulator / self.step_time
+        return steps
+
+
+
+    # forgets the time spent outside the game loop (messages, pauses, loading)
+    def reset(self):
+        self._last_time = time.perf_counter()
+        self.accumulator = 0.0
+        self.alpha = 0.0